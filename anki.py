@@ -1,6 +1,10 @@
+import asyncio
 import requests
-import sys
 import logging
+import threading
+from collections import OrderedDict
+import httpx
+import orjson
 from word import Word, word_to_anki
 from config import ENABLE_ANKI_SYNC, ANKI_CONNECT_URL
 
@@ -10,6 +14,62 @@ TAGS = ["gpt"]
 
 logger = logging.getLogger(__name__)
 
+# Shared session so every AnkiConnect call reuses a pooled keep-alive connection.
+# Built on first use, so importing this module for build_note does no HTTP setup.
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Single-pass escaping of backslashes and quotes in Anki search values
+_ANKI_ESCAPE = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+
+# Async client for the bot's event loop, created lazily inside the running loop
+_aio_client: httpx.AsyncClient | None = None
+
+# Recently seen note ids keyed by (deck_name, dutch), so repeated edits skip findNotes
+_NOTE_ID_CACHE_SIZE = 1024
+_note_id_cache: OrderedDict[tuple[str, str], int] = OrderedDict()
+_note_id_cache_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate"})
+                session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+                _session = session
+    return _session
+
+def anki_request(payload: dict, timeout: float = 5) -> dict:
+    """Post a payload to AnkiConnect on the shared session and return the decoded response."""
+    response = _get_session().post(ANKI_CONNECT_URL, data=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=timeout)
+    return orjson.loads(response.content)
+
+def _remember_note_id(word: Word, deck_name: str, note_id: int) -> None:
+    with _note_id_cache_lock:
+        _note_id_cache[(deck_name, word.dutch)] = note_id
+        _note_id_cache.move_to_end((deck_name, word.dutch))
+        while len(_note_id_cache) > _NOTE_ID_CACHE_SIZE:
+            _note_id_cache.popitem(last=False)
+
+def _cached_note_id(word: Word, deck_name: str) -> int | None:
+    with _note_id_cache_lock:
+        note_id = _note_id_cache.get((deck_name, word.dutch))
+        if note_id is not None:
+            _note_id_cache.move_to_end((deck_name, word.dutch))
+        return note_id
+
+def _forget_note_id(note_id: int) -> None:
+    with _note_id_cache_lock:
+        for key in [k for k, v in _note_id_cache.items() if v == note_id]:
+            del _note_id_cache[key]
+
 def build_note(word: Word, deck_name: str = DECK_NAME) -> dict:
     # Combine default tags with word-specific tags
     all_tags = list(set(TAGS + word.tags))
@@ -25,66 +85,276 @@ def build_note(word: Word, deck_name: str = DECK_NAME) -> dict:
     }
 
 
+def _multi(actions: list[dict]) -> list:
+    """
+    Runs the given actions in a single AnkiConnect "multi" request.
+    Returns the list of per-action results, each a {"result", "error"} dict.
+    """
+    payload = {
+        "action": "multi",
+        "version": 6,
+        "params": {
+            "actions": actions
+        }
+    }
+    response = anki_request(payload)
+    if response.get("error"):
+        raise RuntimeError(f"AnkiConnect multi error: {response['error']}")
+    return response.get("result") or []
+
+def _escape_query(value: str) -> str:
+    # Escape special characters for Anki search
+    # In Anki search: backslash escapes quotes, and we wrap in quotes
+    return value.translate(_ANKI_ESCAPE)
+
+def _find_notes_action(word: Word, deck_name: str) -> dict:
+    return {
+        "action": "findNotes",
+        "version": 6,
+        "params": {
+            "query": f'deck:"{deck_name}" Word:"{_escape_query(word.dutch)}"'
+        }
+    }
+
+def _update_fields_action(note_id: int, word: Word, deck_name: str, fields: dict | None = None) -> dict:
+    return {
+        "action": "updateNoteFields",
+        "version": 6,
+        "params": {
+            "note": {
+                "id": note_id,
+                "fields": fields if fields is not None else build_note(word, deck_name)["fields"]
+            }
+        }
+    }
+
+def _add_note_actions(words: list[Word], deck_name: str) -> list[dict]:
+    # Can't use addNotes because it fails the whole batch on duplicates,
+    # so send one addNote per word inside a single multi request instead.
+    return [
+        {"action": "addNote", "version": 6, "params": {"note": build_note(word, deck_name)}}
+        for word in words
+    ]
+
+def _collect_add_results(words: list[Word], results: list) -> tuple[list[int | None], list[int]]:
+    """
+    Reads the per-word addNote results of a multi request.
+    Returns (note_ids, duplicate_indexes).
+    """
+    note_ids: list[int | None] = [None] * len(words)
+    duplicates = []
+    for i, (word, res) in enumerate(zip(words, results)):
+        error = res.get("error") if isinstance(res, dict) else None
+        if not error:
+            note_ids[i] = res.get("result") if isinstance(res, dict) else res
+            logger.info(f"Note added successfully: {word.dutch}")
+        elif "duplicate" in error:
+            duplicates.append(i)
+        else:
+            logger.error(f"Error adding note {word.dutch}: {error}")
+    return note_ids, duplicates
+
+def _update_duplicates(words: list[Word], note_ids: list[int | None], duplicates: list[int], deck_name: str,
+                       add_actions: list[dict] | None = None) -> None:
+    """
+    Updates the notes that already existed in Anki, filling their ids into note_ids.
+    Reuses the fields from add_actions when given instead of rebuilding them.
+    """
+    if not duplicates:
+        return
+
+    # Look up the existing notes, then update them in one go
+    known = find_note_ids_bulk([words[i] for i in duplicates], deck_name)
+    updates = []
+    for i in duplicates:
+        nid = known.get(words[i].dutch)
+        if nid:
+            updates.append((i, nid))
+        else:
+            logger.error(f"Could not find note to update for: {words[i].dutch}")
+
+    if updates:
+        updated = _multi([
+            _update_fields_action(nid, words[i], deck_name,
+                                  add_actions[i]["params"]["note"]["fields"] if add_actions else None)
+            for i, nid in updates
+        ])
+        for (i, nid), res in zip(updates, updated):
+            if res.get("error"):
+                logger.error(f"Error updating note {nid}: {res['error']}")
+                _forget_note_id(nid)
+            else:
+                note_ids[i] = nid
+                logger.info(f"Note updated successfully: {words[i].dutch}")
+
+def _remember_added(words: list[Word], note_ids: list[int | None], deck_name: str) -> list[tuple[Word, int | None]]:
+    for word, note_id in zip(words, note_ids):
+        if note_id:
+            _remember_note_id(word, deck_name, note_id)
+    return list(zip(words, note_ids))
+
+def _log_sync_result(res: dict) -> None:
+    error = res.get("error") if isinstance(res, dict) else None
+    if error:
+        logger.error(f"Error during sync: {error}")
+    else:
+        logger.info("Sync successful.")
+
+def _pop_sync_result(results: list, actions: list[dict]) -> None:
+    """Log and remove the trailing sync result of a multi request, if it came back."""
+    if len(results) == len(actions):
+        _log_sync_result(results.pop())
+    else:
+        logger.warning(f"AnkiConnect returned {len(results)} results for {len(actions)} actions, sync result missing")
+
 def add_notes(words: list[Word], deck_name: str = DECK_NAME) -> list[tuple[Word, int | None]]:
     """
     Adds the given words to Anki via the AnkiConnect API.
     Each Word object will be added as a note in a given deck_name.
     Returns a list of tuples: (Word, note_id or None).
     """
-    # Can't use addNotes because it fails the whole batch on duplicates
-    return [(word, add_note(word, deck_name)) for word in words]
+    if not words:
+        return []
 
-def find_note_id(word: Word, deck_name: str = DECK_NAME) -> int | None:
+    try:
+        actions = _add_note_actions(words, deck_name)
+        results = _multi(actions)
+        note_ids, duplicates = _collect_add_results(words, results)
+        _update_duplicates(words, note_ids, duplicates, deck_name, actions)
+        return _remember_added(words, note_ids, deck_name)
+
+    except (requests.exceptions.RequestException, RuntimeError) as e:
+        logger.error(f"Connection error to AnkiConnect: {e}")
+        return [(word, None) for word in words]
+
+def add_and_sync(words: list[Word], deck_name: str = DECK_NAME,
+                 sync: bool = True) -> list[tuple[Word, int | None]]:
     """
-    Finds the note id for a given word in the specified deck. Returns the note id or None.
+    Adds the given words to Anki and syncs with AnkiWeb in a single multi request.
+    Existing notes are updated in a follow-up request.
+    Pass sync=False to only add/update the notes and leave syncing to the caller.
+    Returns a list of tuples: (Word, note_id or None).
     """
+    sync = sync and ENABLE_ANKI_SYNC
+    actions = _add_note_actions(words, deck_name)
+    if sync:
+        actions.append({"action": "sync", "version": 6})
+    if not actions:
+        return []
+
     try:
-        # Escape special characters for Anki search
-        # In Anki search: backslash escapes quotes, and we wrap in quotes
-        dutch_escaped = word.dutch.replace('\\', '\\\\').replace('"', '\\"')
+        results = _multi(actions)
+        if sync:
+            _pop_sync_result(results, actions)
+        note_ids, duplicates = _collect_add_results(words, results)
+        _update_duplicates(words, note_ids, duplicates, deck_name, actions)
+        return _remember_added(words, note_ids, deck_name)
 
-        # Use proper Anki search syntax: Field:"value"
-        find_payload = {
-            "action": "findNotes",
+    except (requests.exceptions.RequestException, RuntimeError) as e:
+        logger.error(f"Connection error to AnkiConnect: {e}")
+        return [(word, None) for word in words]
+
+def find_note_ids_bulk(words: list[Word], deck_name: str = DECK_NAME) -> dict[str, int]:
+    """
+    Finds the note ids for the given words with a single findNotes + notesInfo round trip.
+    Returns a dict mapping each found Dutch word to its note id.
+    """
+    result: dict[str, int] = {}
+    pending = []
+    for word in words:
+        note_id = _cached_note_id(word, deck_name)
+        if note_id:
+            result[word.dutch] = note_id
+        else:
+            pending.append(word)
+
+    if not pending:
+        return result
+
+    terms = " OR ".join(f'Word:"{_escape_query(word.dutch)}"' for word in pending)
+    find_payload = {
+        "action": "findNotes",
+        "version": 6,
+        "params": {
+            "query": f'deck:"{deck_name}" ({terms})'
+        }
+    }
+
+    try:
+        find_response = anki_request(find_payload)
+        if find_response.get("error"):
+            logger.error(f"Anki search error: {find_response['error']}")
+            return result
+
+        note_ids = find_response.get("result", [])
+        if not note_ids:
+            return result
+
+        info_payload = {
+            "action": "notesInfo",
             "version": 6,
             "params": {
-                "query": f'deck:"{deck_name}" Word:"{dutch_escaped}"'
+                "notes": note_ids
             }
         }
+        info_response = anki_request(info_payload)
+        if info_response.get("error"):
+            logger.error(f"Anki notesInfo error: {info_response['error']}")
+            return result
+
+        wanted = {word.dutch: word for word in pending}
+        for note in info_response.get("result", []):
+            dutch = note.get("fields", {}).get("Word", {}).get("value", "")
+            if dutch in wanted and dutch not in result:
+                result[dutch] = note["noteId"]
+                _remember_note_id(wanted[dutch], deck_name, note["noteId"])
+
+        return result
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Connection error while finding notes: {e}")
+        return result
+
+def find_note_id(word: Word, deck_name: str = DECK_NAME) -> int | None:
+    """
+    Finds the note id for a given word in the specified deck. Returns the note id or None.
+    """
+    cached_id = _cached_note_id(word, deck_name)
+    if cached_id:
+        return cached_id
+
+    try:
+        # Use proper Anki search syntax: Field:"value"
+        find_payload = _find_notes_action(word, deck_name)
 
-        find_response = requests.post(ANKI_CONNECT_URL, json=find_payload, timeout=5).json()
+        find_response = anki_request(find_payload)
 
         if find_response.get("error"):
             logger.error(f"Anki search error for '{word.dutch}': {find_response['error']}")
             return None
 
         note_ids = find_response.get("result", [])
+        if note_ids:
+            _remember_note_id(word, deck_name, note_ids[0])
         return note_ids[0] if note_ids else None
 
     except requests.exceptions.RequestException as e:
         logger.error(f"Connection error while finding note for {word.dutch}: {e}")
         return None
 
-def update_note(word: Word, deck_name: str = DECK_NAME) -> int | None:
+def update_note(word: Word, deck_name: str = DECK_NAME, prebuilt_fields: dict | None = None) -> int | None:
     """
     Updates an existing note in Anki with new fields for the given word.
+    Pass prebuilt_fields to reuse fields already built by build_note.
     Returns the note_id if successful, None otherwise.
     """
     note_id = find_note_id(word, deck_name)
     if note_id:
-        update_payload = {
-            "action": "updateNoteFields",
-            "version": 6,
-            "params": {
-                "note": {
-                    "id": note_id,
-                    "fields": build_note(word, deck_name)["fields"]
-                }
-            }
-        }
-        update_response = requests.post(ANKI_CONNECT_URL, json=update_payload, timeout=5).json()
+        update_payload = _update_fields_action(note_id, word, deck_name, prebuilt_fields)
+        update_response = anki_request(update_payload)
         if update_response.get("error"):
             logger.error(f"Error updating note: {update_response['error']}")
+            _forget_note_id(note_id)
             return None
         else:
             logger.info(f"Note updated successfully: {word.dutch}")
@@ -93,33 +363,27 @@ def update_note(word: Word, deck_name: str = DECK_NAME) -> int | None:
         logger.error(f"Could not find note to update for: {word.dutch}")
         return None
 
-def update_note_by_id(note_id: int, word: Word, deck_name: str = DECK_NAME) -> bool:
+def update_note_by_id(note_id: int, word: Word, deck_name: str = DECK_NAME, prebuilt_fields: dict | None = None) -> bool:
     """
     Updates an existing note in Anki by note ID.
+    Pass prebuilt_fields to reuse fields already built by build_note.
     Returns True if successful, False otherwise.
     """
     if not note_id:
         logger.warning("Cannot update note: No note ID provided")
         return False
 
-    update_payload = {
-        "action": "updateNoteFields",
-        "version": 6,
-        "params": {
-            "note": {
-                "id": note_id,
-                "fields": build_note(word, deck_name)["fields"]
-            }
-        }
-    }
+    update_payload = _update_fields_action(note_id, word, deck_name, prebuilt_fields)
 
     try:
-        update_response = requests.post(ANKI_CONNECT_URL, json=update_payload, timeout=5).json()
+        update_response = anki_request(update_payload)
         if update_response.get("error"):
             logger.error(f"Error updating note {note_id}: {update_response['error']}")
+            _forget_note_id(note_id)
             return False
         else:
             logger.info(f"Note updated successfully: {word.dutch} (note_id: {note_id})")
+            _remember_note_id(word, deck_name, note_id)
             return True
     except requests.exceptions.RequestException as e:
         logger.error(f"Connection error to AnkiConnect while updating note: {e}")
@@ -131,27 +395,31 @@ def add_note(word: Word, deck_name: str = DECK_NAME) -> int | None:
     If the note already exists, updates it instead.
     Returns the note_id if successful, None otherwise.
     """
+    # Build the note once so the duplicate branch can reuse its fields
+    note_body = build_note(word, deck_name)
     payload = {
         "action": "addNote",
         "version": 6,
         "params": {
-            "note": build_note(word)
+            "note": note_body
         }
     }
 
     try:
-        response = requests.post(ANKI_CONNECT_URL, json=payload, timeout=5).json()
+        response = anki_request(payload)
 
         if response.get("error"):
             if "cannot create note because it is a duplicate" in response["error"]:
                 logger.info(f"Note already exists: {word.dutch}, updating note...")
-                return update_note(word, deck_name)
+                return update_note(word, deck_name, prebuilt_fields=note_body["fields"])
             else:
                 logger.error(f"Error adding note: {response['error']}")
                 return None
         else:
             note_id = response.get("result")
             logger.info(f"Note added successfully: {word.dutch}")
+            if note_id:
+                _remember_note_id(word, deck_name, note_id)
             return note_id
 
     except requests.exceptions.RequestException as e:
@@ -176,19 +444,53 @@ def delete_note(anki_note_id: int) -> bool:
     }
 
     try:
-        response = requests.post(ANKI_CONNECT_URL, json=payload, timeout=5).json()
+        response = anki_request(payload)
 
         if response.get("error"):
             logger.error(f"Error deleting note {anki_note_id}: {response['error']}")
             return False
         else:
             logger.info(f"Note deleted successfully: {anki_note_id}")
+            _forget_note_id(anki_note_id)
             return True
 
     except requests.exceptions.RequestException as e:
         logger.error(f"Connection error to AnkiConnect while deleting note: {e}")
         return False
 
+def delete_notes(anki_note_ids: list[int]) -> bool:
+    """
+    Delete several notes from Anki with a single deleteNotes request.
+    Returns True if successful, False otherwise.
+    """
+    anki_note_ids = [note_id for note_id in anki_note_ids if note_id]
+    if not anki_note_ids:
+        return True
+
+    payload = {
+        "action": "deleteNotes",
+        "version": 6,
+        "params": {
+            "notes": anki_note_ids
+        }
+    }
+
+    try:
+        response = anki_request(payload)
+
+        if response.get("error"):
+            logger.error(f"Error deleting {len(anki_note_ids)} notes: {response['error']}")
+            return False
+
+        logger.info(f"Deleted {len(anki_note_ids)} notes")
+        for note_id in anki_note_ids:
+            _forget_note_id(note_id)
+        return True
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Connection error to AnkiConnect while deleting notes: {e}")
+        return False
+
 def sync_anki() -> None:
     """
     Sync collections with AnkiWeb.
@@ -202,7 +504,7 @@ def sync_anki() -> None:
     }
 
     try:
-        response = requests.post(ANKI_CONNECT_URL, json=payload, timeout=5).json()
+        response = anki_request(payload)
 
         if response.get("error"):
             logger.error(f"Error during sync: {response['error']}")
@@ -213,3 +515,187 @@ def sync_anki() -> None:
     except requests.exceptions.RequestException as e:
         logger.error(f"Connection error to AnkiConnect: {e}")
         return {"error": f"Connection error: {str(e)}"}
+
+def warm_up() -> bool:
+    """
+    Open the pooled AnkiConnect connection ahead of the first real request.
+    Returns True if AnkiConnect answered.
+    """
+    if not ENABLE_ANKI_SYNC:
+        return False
+
+    try:
+        anki_request({"action": "version", "version": 6}, timeout=2)
+        return True
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Could not warm up AnkiConnect connection: {e}")
+        return False
+
+
+# ==================== Async API ====================
+
+def _get_async_client() -> httpx.AsyncClient:
+    global _aio_client
+    if _aio_client is None or _aio_client.is_closed:
+        _aio_client = httpx.AsyncClient(timeout=5)
+    return _aio_client
+
+async def close_async_client() -> None:
+    """Close the async AnkiConnect client, if it was opened."""
+    global _aio_client
+    if _aio_client is not None:
+        await _aio_client.aclose()
+        _aio_client = None
+
+async def _post_async(payload: dict) -> dict:
+    response = await _get_async_client().post(ANKI_CONNECT_URL, content=orjson.dumps(payload), headers=_JSON_HEADERS)
+    return orjson.loads(response.content)
+
+async def _multi_async(actions: list[dict]) -> list:
+    response = await _post_async({
+        "action": "multi",
+        "version": 6,
+        "params": {
+            "actions": actions
+        }
+    })
+    if response.get("error"):
+        raise RuntimeError(f"AnkiConnect multi error: {response['error']}")
+    return response.get("result") or []
+
+async def add_and_sync_async(words: list[Word], deck_name: str = DECK_NAME,
+                             sync: bool = True) -> list[tuple[Word, int | None]]:
+    """
+    Async version of add_and_sync.
+    Pass sync=False to only add the notes and leave syncing to the caller.
+    Returns a list of tuples: (Word, note_id or None).
+    """
+    sync = sync and ENABLE_ANKI_SYNC
+    actions = _add_note_actions(words, deck_name)
+    if sync:
+        actions.append({"action": "sync", "version": 6})
+    if not actions:
+        return []
+
+    try:
+        results = await _multi_async(actions)
+        if sync:
+            _pop_sync_result(results, actions)
+        note_ids, duplicates = _collect_add_results(words, results)
+        if duplicates:
+            # Duplicates are the rare path, so reuse the blocking bulk update off the loop
+            await asyncio.to_thread(_update_duplicates, words, note_ids, duplicates, deck_name, actions)
+        return _remember_added(words, note_ids, deck_name)
+
+    except (httpx.HTTPError, requests.exceptions.RequestException, RuntimeError) as e:
+        logger.error(f"Connection error to AnkiConnect: {e}")
+        return [(word, None) for word in words]
+
+async def update_note_async(word: Word, deck_name: str = DECK_NAME, prebuilt_fields: dict | None = None) -> int | None:
+    """
+    Async version of update_note.
+    Returns the note_id if successful, None otherwise.
+    """
+    note_id = _cached_note_id(word, deck_name)
+    if not note_id:
+        find_response = await _post_async(_find_notes_action(word, deck_name))
+        if find_response.get("error"):
+            logger.error(f"Anki search error for '{word.dutch}': {find_response['error']}")
+            return None
+        note_ids = find_response.get("result", [])
+        note_id = note_ids[0] if note_ids else None
+
+    if not note_id:
+        logger.error(f"Could not find note to update for: {word.dutch}")
+        return None
+
+    update_response = await _post_async(_update_fields_action(note_id, word, deck_name, prebuilt_fields))
+    if update_response.get("error"):
+        logger.error(f"Error updating note: {update_response['error']}")
+        _forget_note_id(note_id)
+        return None
+
+    logger.info(f"Note updated successfully: {word.dutch}")
+    _remember_note_id(word, deck_name, note_id)
+    return note_id
+
+async def add_note_async(word: Word, deck_name: str = DECK_NAME) -> int | None:
+    """
+    Async version of add_note for callers running on an event loop.
+    If the note already exists, updates it instead.
+    Returns the note_id if successful, None otherwise.
+    """
+    note_body = build_note(word, deck_name)
+    payload = {
+        "action": "addNote",
+        "version": 6,
+        "params": {
+            "note": note_body
+        }
+    }
+
+    try:
+        response = await _post_async(payload)
+
+        if response.get("error"):
+            if "cannot create note because it is a duplicate" in response["error"]:
+                logger.info(f"Note already exists: {word.dutch}, updating note...")
+                return await update_note_async(word, deck_name, prebuilt_fields=note_body["fields"])
+            else:
+                logger.error(f"Error adding note: {response['error']}")
+                return None
+        else:
+            note_id = response.get("result")
+            logger.info(f"Note added successfully: {word.dutch}")
+            if note_id:
+                _remember_note_id(word, deck_name, note_id)
+            return note_id
+
+    except httpx.HTTPError as e:
+        logger.error(f"Connection error to AnkiConnect: {e}")
+        return None
+
+async def sync_anki_async() -> dict:
+    """
+    Async version of sync_anki.
+    """
+    if not ENABLE_ANKI_SYNC:
+        return {"result": None, "sync_skipped": True}
+
+    payload = {
+        "action": "sync",
+        "version": 6
+    }
+
+    try:
+        response = await _post_async(payload)
+
+        if response.get("error"):
+            logger.error(f"Error during sync: {response['error']}")
+        else:
+            logger.info("Sync successful.")
+
+        return response
+    except httpx.HTTPError as e:
+        logger.error(f"Connection error to AnkiConnect: {e}")
+        return {"error": f"Connection error: {str(e)}"}
+
+async def warm_up_async() -> bool:
+    """
+    Async version of warm_up, opening the async client's connection.
+    Returns True if AnkiConnect answered.
+    """
+    if not ENABLE_ANKI_SYNC:
+        return False
+
+    try:
+        await _get_async_client().post(
+            ANKI_CONNECT_URL,
+            content=orjson.dumps({"action": "version", "version": 6}),
+            headers=_JSON_HEADERS,
+            timeout=2,
+        )
+        return True
+    except httpx.HTTPError as e:
+        logger.warning(f"Could not warm up AnkiConnect connection: {e}")
+        return False
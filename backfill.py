@@ -1,13 +1,14 @@
 """
 Backfill operations between Anki and the local database.
 """
+import itertools
 import requests
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from word import Word
-from db import WordDatabase
-from anki import add_note
-from config import ANKI_CONNECT_URL
+from db import WordDatabase, get_db
+from anki import add_note, anki_request
 
 # Load environment variables from .env file
 load_dotenv()
@@ -16,6 +17,21 @@ logger = logging.getLogger(__name__)
 
 DECK_NAME = "Default"
 MODEL_NAME = "GPT"
+EXPORT_WORKERS = 8
+NOTES_INFO_CHUNK_SIZE = 500
+
+
+def _field(fields: dict, field_name: str) -> str:
+    # Handle both direct string and {"value": ""} format
+    field = fields.get(field_name, "")
+    if isinstance(field, dict):
+        return field.get("value", "")
+    return field
+
+
+def _lines(value: str) -> list[str]:
+    """Split a multi-line field into its stripped, non-empty lines."""
+    return [line for line in (raw.strip() for raw in value.splitlines()) if line]
 
 
 def anki_to_word(note: dict) -> Word | None:
@@ -26,38 +42,79 @@ def anki_to_word(note: dict) -> Word | None:
     try:
         fields = note.get("fields", {})
 
-        # Extract field values (handle both direct string and {"value": ""} format)
-        def get_field_value(field_name: str) -> str:
-            field = fields.get(field_name, "")
-            if isinstance(field, dict):
-                return field.get("value", "")
-            return field
-
         return Word(
-            dutch=get_field_value("Word"),
-            translation=get_field_value("Translation"),
-            definition_nl=get_field_value("Definition"),
-            definition_en=get_field_value("Definition (eng)"),
-            pronunciation=get_field_value("Pronunciation"),
-            grammar=get_field_value("Grammar"),
-            collocations=[line.strip() for line in get_field_value("Collocations").split("\n") if line.strip()],
-            synonyms=[line.strip() for line in get_field_value("Synonyms").split("\n") if line.strip()],
-            examples_nl=[line.strip() for line in get_field_value("Examples").split("\n") if line.strip()],
-            examples_en=[line.strip() for line in get_field_value("Examples (eng)").split("\n") if line.strip()],
-            etymology=get_field_value("Etymology"),
-            related=[line.strip() for line in get_field_value("Related").split("\n") if line.strip()]
+            dutch=_field(fields, "Word"),
+            translation=_field(fields, "Translation"),
+            definition_nl=_field(fields, "Definition"),
+            definition_en=_field(fields, "Definition (eng)"),
+            pronunciation=_field(fields, "Pronunciation"),
+            grammar=_field(fields, "Grammar"),
+            collocations=_lines(_field(fields, "Collocations")),
+            synonyms=_lines(_field(fields, "Synonyms")),
+            examples_nl=_lines(_field(fields, "Examples")),
+            examples_en=_lines(_field(fields, "Examples (eng)")),
+            etymology=_field(fields, "Etymology"),
+            related=_lines(_field(fields, "Related"))
         )
     except Exception as e:
         logger.error(f"Error converting Anki note to Word: {e}")
         return None
 
 
+def _fetch_notes_info(note_ids: tuple[int, ...]) -> list[dict]:
+    """Fetch note details for one chunk of note ids."""
+    notes_info_payload = {
+        "action": "notesInfo",
+        "version": 6,
+        "params": {
+            "notes": list(note_ids)
+        }
+    }
+    return anki_request(notes_info_payload, timeout=10).get("result") or []
+
+
+def _save_notes(db: WordDatabase, notes: list[dict], deck_name: str) -> int:
+    """Save one chunk of Anki notes to the database. Returns the number saved."""
+    converted = []
+    for note in notes:
+        word = anki_to_word(note)
+        if word:
+            converted.append((word, note.get("noteId")))
+
+    saved_words = []
+    saved_note_ids = []
+    try:
+        # One transaction for the whole chunk
+        db.save_words([word for word, _ in converted])
+        saved_words = [word.dutch for word, _ in converted]
+        saved_note_ids = [note_id for _, note_id in converted]
+        logger.info(f"Saved {len(saved_words)} words")
+    except Exception as e:
+        logger.error(f"Error saving {len(converted)} words to database, retrying one by one: {e}")
+        for word, note_id in converted:
+            try:
+                db.save_word(word)
+                saved_words.append(word.dutch)
+                saved_note_ids.append(note_id)
+                logger.info(f"Saved: {word.dutch}")
+            except Exception as e:
+                logger.error(f"Error saving word to database: {e}")
+
+    if saved_words:
+        try:
+            db.mark_multiple_synced(saved_words, saved_note_ids, deck_name)
+        except Exception as e:
+            # The words are saved either way; they just show up as unsynced
+            logger.error(f"Failed to mark {len(saved_words)} words as synced - {e}")
+    return len(saved_words)
+
+
 def export_anki_to_db(deck_name: str = DECK_NAME) -> tuple[int, int]:
     """
     Export all words from Anki to the database.
     Returns tuple of (successful_count, total_count).
     """
-    db = WordDatabase()
+    db = get_db()
 
     # Step 1: Find all notes in the deck with the GPT model
     find_payload = {
@@ -69,7 +126,7 @@ def export_anki_to_db(deck_name: str = DECK_NAME) -> tuple[int, int]:
     }
 
     try:
-        find_response = requests.post(ANKI_CONNECT_URL, json=find_payload, timeout=10).json()
+        find_response = anki_request(find_payload, timeout=10)
         note_ids = find_response.get("result", [])
 
         if not note_ids:
@@ -78,34 +135,28 @@ def export_anki_to_db(deck_name: str = DECK_NAME) -> tuple[int, int]:
 
         logger.info(f"Found {len(note_ids)} notes in Anki")
 
-        # Step 2: Get note details
-        notes_info_payload = {
-            "action": "notesInfo",
-            "version": 6,
-            "params": {
-                "notes": note_ids
-            }
-        }
-
-        notes_response = requests.post(ANKI_CONNECT_URL, json=notes_info_payload, timeout=10).json()
-        notes = notes_response.get("result", [])
-
-        # Step 3: Convert to Word objects and save to database
+        # Step 2: Fetch note details in chunks, requesting the next chunk
+        # while the current one is converted and saved to the database
         success_count = 0
-        for note in notes:
-            word = anki_to_word(note)
-            if word:
-                try:
-                    note_id = note.get("noteId")
-                    db.save_word(word)
-                    db.mark_synced(word.dutch, note_id)
-                    success_count += 1
-                    logger.info(f"Saved: {word.dutch}")
-                except Exception as e:
-                    logger.error(f"Error saving word to database: {e}")
-
-        logger.info(f"Successfully imported {success_count}/{len(notes)} notes from Anki to database")
-        return (success_count, len(notes))
+        total_count = 0
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            chunks = itertools.batched(note_ids, NOTES_INFO_CHUNK_SIZE)
+            first = next(chunks, None)
+            pending = prefetcher.submit(_fetch_notes_info, first) if first else None
+            while pending:
+                notes = pending.result()
+                next_chunk = next(chunks, None)
+                pending = prefetcher.submit(_fetch_notes_info, next_chunk) if next_chunk else None
+
+                # Step 3: Convert to Word objects and save to database
+                total_count += len(notes)
+                success_count += _save_notes(db, notes, deck_name)
+
+        logger.info(f"Successfully imported {success_count}/{total_count} notes from Anki to database")
+        if success_count:
+            # A bulk load leaves the search index in many small segments
+            db.optimize_search_index()
+        return (success_count, total_count)
 
     except requests.exceptions.RequestException as e:
         logger.error(f"Connection error to AnkiConnect: {e}")
@@ -117,7 +168,7 @@ def export_db_to_anki(deck_name: str = DECK_NAME) -> tuple[int, int]:
     Export all words from database to Anki.
     Returns tuple of (successful_count, total_count).
     """
-    db = WordDatabase()
+    db = get_db()
     all_words = db.get_all_words()
 
     if not all_words:
@@ -126,13 +177,26 @@ def export_db_to_anki(deck_name: str = DECK_NAME) -> tuple[int, int]:
 
     logger.info(f"Found {len(all_words)} words in database")
 
-    success_count = 0
-    for word in all_words:
-        note_id = add_note(word, deck_name)
-        if note_id:
-            db.mark_synced(word.dutch, note_id)
-            success_count += 1
-            logger.info(f"Added to Anki: {word.dutch}")
+    # Overlap the AnkiConnect round-trips; the shared session pool is sized for EXPORT_WORKERS
+    synced_words = []
+    synced_note_ids = []
+    with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as executor:
+        futures = {executor.submit(add_note, word, deck_name): word for word in all_words}
+        for future in as_completed(futures):
+            word = futures[future]
+            note_id = future.result()
+            if note_id:
+                synced_words.append(word.dutch)
+                synced_note_ids.append(note_id)
+                logger.info(f"Added to Anki: {word.dutch}")
+
+    # Record all sync results in a single transaction
+    if synced_words:
+        try:
+            db.mark_multiple_synced(synced_words, synced_note_ids, deck_name)
+        except Exception as e:
+            logger.error(f"Failed to mark {len(synced_words)} words as synced - {e}")
+    success_count = len(synced_words)
 
     logger.info(f"Successfully exported {success_count}/{len(all_words)} words from database to Anki")
     return (success_count, len(all_words))
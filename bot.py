@@ -1,12 +1,16 @@
 import os
+import functools
 import logging
 from dotenv import load_dotenv
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, BotCommand
 from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters, CallbackQueryHandler
 import asyncio
+from datetime import timedelta
+from telegram.error import RetryAfter
 
-from chatgpt import get_definitions
-from anki import sync_anki
+from chatgpt import aget_definitions, split_entries, close_async_client as close_openai_client
+from anki import sync_anki_async, add_and_sync_async, close_async_client, warm_up, warm_up_async
+from config import ENABLE_ANKI_SYNC
 from word import Word, word_to_html, WordList
 from user_settings import get_user_config, set_user_model, set_user_effort, ALLOWED_MODELS, ALLOWED_EFFORTS
 from word_service import WordService
@@ -15,7 +19,7 @@ from word_service import WordService
 load_dotenv()
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "your_telegram_bot_token_here")
-ALLOWED_USER_IDS = set(map(int, os.getenv("ALLOWED_USER_IDS", "").split(",")))
+ALLOWED_USER_IDS: frozenset[int] = frozenset(int(x) for x in os.getenv("ALLOWED_USER_IDS", "").split(",") if x.strip())
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -27,6 +31,22 @@ REGENERATE_WORD_CALLBACK_PREFIX = "regenerate_word:"
 SHOW_MORE_CALLBACK_PREFIX = "show_more:"
 SHOW_LESS_CALLBACK_PREFIX = "show_less:"
 
+# Seconds to wait after a new word before syncing, so bursts share one AnkiWeb sync
+SYNC_DEBOUNCE_SECONDS = 5
+
+# Concurrent replies per user when sending several words at once
+REPLY_CONCURRENCY = 5
+_reply_semaphores: dict[int, asyncio.Semaphore] = {}
+
+_sync_event = asyncio.Event()
+_sync_task: asyncio.Task | None = None
+
+# New words arriving within this window are saved and added to Anki together
+SAVE_BATCH_WINDOW_SECONDS = 0.5
+
+_save_queue: asyncio.Queue = asyncio.Queue()
+_save_task: asyncio.Task | None = None
+
 TELEGRAM_COMMANDS = (
     BotCommand("start", "Show available commands"),
     BotCommand("set_model", "Set OpenAI model"),
@@ -34,10 +54,11 @@ TELEGRAM_COMMANDS = (
     BotCommand("settings", "View current settings"),
 )
 
-def authorized(func):
+def authorized(func, _allowed=ALLOWED_USER_IDS):
+    @functools.wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
         user_id = update.effective_user.id
-        if user_id not in ALLOWED_USER_IDS:
+        if user_id not in _allowed:
             if update.callback_query:
                 await update.callback_query.answer(
                     f"You are not authorized to use this bot (ID: {user_id}).",
@@ -51,9 +72,11 @@ def authorized(func):
     return wrapper
 
 
-def generate_word(user_input: str, user_id: int, effort_override: str | None = None) -> WordList:
+async def generate_word(user_input: str, user_id: int, effort_override: str | None = None,
+                        use_cache: bool = True, on_word=None) -> WordList:
     """Generate word definitions using ChatGPT without saving."""
-    response = get_definitions(user_input, user_id, effort_override=effort_override)
+    response = await aget_definitions(user_input, user_id, effort_override=effort_override,
+                                      use_cache=use_cache, on_word=on_word)
     return response
 
 def higher_effort(effort: str) -> str:
@@ -107,6 +130,31 @@ async def reply_word_message(message, prefix: str, word: Word, word_id: int | No
     )
 
 
+async def reply_words_message(message, prefix: str, words: list[Word], word_ids: list[int | None], user_id: int):
+    """Reply with several words concurrently, resending one by one if Telegram throttles us."""
+    htmls = [word_to_html(word) for word in words]
+    semaphore = _reply_semaphores.setdefault(user_id, asyncio.Semaphore(REPLY_CONCURRENCY))
+
+    async def send(response_text: str, word_id: int | None):
+        async with semaphore:
+            await message.reply_html(
+                f"{prefix}\n\n{response_text}",
+                reply_markup=word_actions_keyboard(word_id),
+            )
+
+    results = await asyncio.gather(
+        *(send(response_text, word_id) for response_text, word_id in zip(htmls, word_ids)),
+        return_exceptions=True,
+    )
+    for response_text, word_id, result in zip(htmls, word_ids, results):
+        if isinstance(result, RetryAfter):
+            delay = result.retry_after
+            await asyncio.sleep(delay.total_seconds() if isinstance(delay, timedelta) else delay)
+            await send(response_text, word_id)
+        elif isinstance(result, Exception):
+            raise result
+
+
 def get_message_prefix(message) -> str:
     """Extract the leading status line from a word response message."""
     text = getattr(message, "text_html", None) or getattr(message, "text", "") or ""
@@ -171,15 +219,18 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     await query.answer()
 
-    if data.startswith("model_"):
-        model = data.replace("model_", "")
+    # Settings buttons are "model_<name>" / "effort_<level>"; split them in one pass
+    action, _, value = data.partition("_")
+
+    if action == "model":
+        model = value
         if set_user_model(user_id, model):
             await query.edit_message_text(f"✅ Model set to: {model}")
         else:
             await query.edit_message_text(f"❌ Failed to set model")
 
-    elif data.startswith("effort_"):
-        effort = data.replace("effort_", "")
+    elif action == "effort":
+        effort = value
         if set_user_effort(user_id, effort):
             await query.edit_message_text(f"✅ Reasoning effort set to: {effort}")
         else:
@@ -273,14 +324,15 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         effort = higher_effort(get_user_config(user_id).effort)
         await query.edit_message_text(f"Regenerating {existing_word.dutch} with {effort} reasoning...")
 
-        response = await asyncio.to_thread(generate_word, existing_word.dutch, user_id, effort)
+        response = await generate_word(existing_word.dutch, user_id, effort, use_cache=False)
         if not response.words:
             await query.edit_message_text(f"❌ Could not regenerate word: {existing_word.dutch}")
             return
 
         regenerated_word = response.words[0]
         await asyncio.to_thread(word_service.update_by_id, word_id, regenerated_word)
-        await asyncio.to_thread(sync_anki)
+        # Push to AnkiWeb in the background instead of holding up the reply
+        request_anki_sync()
 
         response_text = word_to_html(regenerated_word)
         await query.edit_message_text(
@@ -296,15 +348,31 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     word_service = WordService()
 
-    # Check if word already exists in database
-    existing_word = await asyncio.to_thread(word_service.get, user_input)
+    # Check if word already exists in database (word and id in one query)
+    existing = (await asyncio.to_thread(word_service.get_many, [user_input])).get(user_input.lower())
 
-    if existing_word:
+    if existing:
         # Word found in database - show it without GPT call
-        word_id = await asyncio.to_thread(word_service.get_id, user_input)
+        word_id, existing_word = existing
         await reply_word(update, "📖 Found in database:", existing_word, word_id)
         return
 
+    # For a list of words, answer the known ones from the database and only generate the rest
+    entries = split_entries(user_input)
+    if len(entries) > 1:
+        known = await asyncio.to_thread(word_service.get_many, entries)
+        novel = []
+        for entry in entries:
+            found = known.get(entry.lower())
+            if found:
+                word_id, word = found
+                await reply_word(update, "📖 Found in database:", word, word_id)
+            else:
+                novel.append(entry)
+        if not novel:
+            return
+        user_input = ", ".join(novel)
+
     status_message = await update.message.reply_text(f"Generating: {user_input}")
     context.application.create_task(
         process_new_word(update.message, status_message, user_input, user_id)
@@ -313,11 +381,25 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def process_new_word(message, status_message, user_input: str, user_id: int):
     """Generate, save, and sync a new word after the handler has returned."""
-    word_service = WordService()
+    pending: list[asyncio.Task] = []
+
+    async def save_and_reply(word: Word, previous: asyncio.Task | None):
+        # Save the word; the save worker adds it to Anki afterwards
+        word_ids = await save_words_queued([word])
+        # Reply after the previous word so Telegram shows them in order
+        if previous:
+            await previous
+        await reply_words_message(message, "✅ Added:", [word], word_ids, user_id)
+
+    async def on_word(word: Word):
+        # Handle each word in the background so the response keeps streaming
+        previous = pending[-1] if pending else None
+        pending.append(asyncio.create_task(save_and_reply(word, previous)))
 
     try:
-        # Word not found - generate with GPT
-        response = await asyncio.to_thread(generate_word, user_input, user_id)
+        # Word not found - generate with GPT, replying to each word as it arrives
+        response = await generate_word(user_input, user_id, on_word=on_word)
+        await asyncio.gather(*pending)
 
         if response.context:
             await message.reply_text(response.context)
@@ -326,31 +408,145 @@ async def process_new_word(message, status_message, user_input: str, user_id: in
             await status_message.edit_text("No words found or could not parse.")
             return
 
-        await status_message.edit_text(f"Saving {len(response.words)} word(s)...")
-
-        # Save new words
-        for new_word in response.words:
-            await asyncio.to_thread(word_service.create, new_word)
-            word_id = await asyncio.to_thread(word_service.get_id, new_word.dutch)
-            await reply_word_message(message, "✅ Added:", new_word, word_id)
-
-        await status_message.edit_text("Syncing with AnkiWeb...")
-        await asyncio.to_thread(sync_anki)
         await status_message.delete()
     except Exception as e:
         logging.exception("Failed to process Telegram word request")
+        # Let the words that already arrived finish replying (and collect their errors),
+        # so no reply shows up after the error message
+        await asyncio.gather(*pending, return_exceptions=True)
         await status_message.edit_text(f"❌ Failed to process word: {e}")
+    finally:
+        # Only still running if this task was cancelled; don't leave them behind
+        for task in pending:
+            if not task.done():
+                task.cancel()
+
+async def save_words_queued(words: list[Word]) -> list[int]:
+    """Queue words for the batched save worker and wait for their database ids."""
+    future = asyncio.get_running_loop().create_future()
+    _save_queue.put_nowait((words, future))
+    return await future
+
+def _save_batch(words: list[Word]) -> list[int | Exception]:
+    """Save words in one transaction, returning the row id or the error for each."""
+    word_service = WordService()
+    for word in words:
+        # Add level as a tag, as WordService.save does
+        if word.level and word.level not in word.tags:
+            word.tags.append(word.level)
+
+    try:
+        return word_service.db.save_words(words)
+    except Exception:
+        logging.exception(f"Failed to save {len(words)} words together, retrying one by one")
+
+    # One by one, so each message gets its own words' errors
+    results = []
+    for word in words:
+        try:
+            results.append(word_service.save(word))
+        except Exception as e:
+            results.append(e)
+    return results
+
+async def _add_to_anki(words: list[Word]):
+    """Add saved words to Anki in one AnkiConnect request; the AnkiWeb sync runs in the background."""
+    word_service = WordService()
+    added = [(word, note_id) for word, note_id in await add_and_sync_async(words, word_service.deck_name, sync=False) if note_id]
+    if added:
+        await asyncio.to_thread(
+            word_service.db.mark_multiple_synced,
+            [word.dutch for word, _ in added],
+            [note_id for _, note_id in added],
+            word_service.deck_name,
+        )
+    request_anki_sync()
+
+async def _save_loop():
+    """Save queued words in batches, then add each batch to Anki."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _save_queue.get()]
+        deadline = loop.time() + SAVE_BATCH_WINDOW_SECONDS
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                batch.append(await asyncio.wait_for(_save_queue.get(), remaining))
+            except TimeoutError:
+                break
+
+        words = [word for batch_words, _ in batch for word in batch_words]
+        try:
+            results = await asyncio.to_thread(_save_batch, words)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+
+        # Hand each waiting message its own ids, or the first error among its words
+        offset = 0
+        for batch_words, future in batch:
+            word_results = results[offset:offset + len(batch_words)]
+            offset += len(batch_words)
+            if future.done():
+                continue
+            error = next((r for r in word_results if isinstance(r, Exception)), None)
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(word_results)
+
+        saved = [word for word, result in zip(words, results) if not isinstance(result, Exception)]
+        if ENABLE_ANKI_SYNC and saved:
+            try:
+                await _add_to_anki(saved)
+            except Exception:
+                logging.exception("Failed to add saved words to Anki")
+
+def request_anki_sync():
+    """Schedule a debounced AnkiWeb sync."""
+    _sync_event.set()
+
+async def _sync_loop():
+    """Run one AnkiWeb sync per burst of requested syncs."""
+    while True:
+        await _sync_event.wait()
+        await asyncio.sleep(SYNC_DEBOUNCE_SECONDS)
+        # Clear before syncing so words added during the sync trigger another one
+        _sync_event.clear()
+        try:
+            await sync_anki_async()
+        except Exception:
+            logging.exception("Background Anki sync failed")
+
+async def post_init(app: Application):
+    """Register slash commands, warm up AnkiConnect and start the background save and sync tasks."""
+    global _sync_task, _save_task
+    await set_telegram_commands(app)
+    # Open the AnkiConnect connections now so the first word doesn't pay for it
+    await asyncio.gather(warm_up_async(), asyncio.to_thread(warm_up))
+    _sync_task = asyncio.create_task(_sync_loop())
+    _save_task = asyncio.create_task(_save_loop())
 
 async def set_telegram_commands(app: Application):
     """Register slash commands so Telegram clients show them when typing /."""
     await app.bot.set_my_commands(TELEGRAM_COMMANDS)
 
+async def post_shutdown(app: Application):
+    """Stop the background tasks and close the shared AnkiConnect and OpenAI clients."""
+    for task in (_sync_task, _save_task):
+        if task is not None:
+            task.cancel()
+    await close_async_client()
+    await close_openai_client()
+
 def main():
     app = (
         Application.builder()
         .token(TELEGRAM_BOT_TOKEN)
         .concurrent_updates(True)
-        .post_init(set_telegram_commands)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
         .build()
     )
 
@@ -358,8 +554,9 @@ def main():
     app.add_handler(CommandHandler("set_model", set_model))
     app.add_handler(CommandHandler("set_effort", set_effort))
     app.add_handler(CommandHandler("settings", settings))
-    app.add_handler(CallbackQueryHandler(button_callback))
-    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+    # Non-blocking so a slow regenerate or lookup doesn't hold up other updates
+    app.add_handler(CallbackQueryHandler(button_callback, block=False))
+    app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message, block=False))
 
     app.run_polling(allowed_updates=Update.ALL_TYPES)
 
@@ -0,0 +1,49 @@
+"""
+Small in-process TTL cache for expensive lookups such as ChatGPT responses.
+
+Values are stored as strings (serialized JSON), so callers always get a fresh
+object back and cached entries can't be mutated by accident.
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+MAX_ENTRIES = 4096
+
+_entries: Dict[str, Tuple[float, str]] = {}
+_lock = threading.Lock()
+
+
+def get(key: str) -> Optional[str]:
+    """Return the cached value for key, or None if it's missing or expired."""
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del _entries[key]
+            return None
+        return value
+
+
+def put(key: str, value: str, ttl: int) -> None:
+    """Store value under key for ttl seconds."""
+    with _lock:
+        if len(_entries) >= MAX_ENTRIES and key not in _entries:
+            _evict()
+        _entries[key] = (time.monotonic() + ttl, value)
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def _evict() -> None:
+    # Drop expired entries first, then the oldest inserted ones
+    now = time.monotonic()
+    for key in [k for k, (expires_at, _) in _entries.items() if expires_at < now]:
+        del _entries[key]
+    while len(_entries) >= MAX_ENTRIES:
+        del _entries[next(iter(_entries))]
@@ -1,10 +1,19 @@
-import json
-from openai import OpenAI
+import asyncio
+import hashlib
+import re
+import threading
+from typing import Awaitable, Callable, Final
+import httpx
+import orjson
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from pydantic_core import from_json
 import os
 import logging
 from pathlib import Path
 from word import Word, WordList, TAGS_ALL, WordTags
 from user_settings import get_user_config
+from config import DEFINITIONS_CACHE_TTL, EXTRACT_WORDS_CACHE_TTL
+import cache
 
 
 logger = logging.getLogger(__name__)
@@ -14,12 +23,50 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-5.5")
 OPENAI_MODEL_EFFORT = os.getenv("OPENAI_MODEL_EFFORT", "medium")
 
+# Clients are shared across calls and created on first use, after .env is loaded
+_client: OpenAI | None = None
+_async_client: AsyncOpenAI | None = None
+_client_lock = threading.Lock()
+
+# Definitions requests currently waiting on the API, keyed like the cache
+_inflight: dict[str, asyncio.Task] = {}
+
+# Sized for the bulk CLI commands and the bot's concurrent updates
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+def _get_client() -> OpenAI:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Thread pool callers (CLI, web viewer) share one pooled HTTP/2 connection
+                http_client = DefaultHttpxClient(http2=True, limits=_HTTP_LIMITS)
+                _client = OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+    return _client
+
+def _get_async_client() -> AsyncOpenAI:
+    global _async_client
+    if _async_client is None:
+        # HTTP/2 lets concurrent requests share one TLS connection to the API
+        http_client = DefaultAsyncHttpxClient(http2=True, limits=_HTTP_LIMITS)
+        _async_client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+    return _async_client
+
+async def close_async_client() -> None:
+    """Close the async OpenAI client, if it was opened."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+
 def load_prompt(filename: str) -> str:
-    return open(Path(__file__).parent / "prompts" / filename, 'r').read()
+    return (PROMPTS_DIR / filename).read_text(encoding="utf-8")
 
-GET_DEFINITIONS_PROMPT_BASE = load_prompt("get_definitions_prompt.md")
+GET_DEFINITIONS_PROMPT_BASE: Final[str] = load_prompt("get_definitions_prompt.md")
 
-EXTRACT_WORDS_PROMPT = load_prompt("extract_words_prompt.md")
+EXTRACT_WORDS_PROMPT: Final[str] = load_prompt("extract_words_prompt.md")
 
 def build_prompt(prompt: str, input_text: str) -> list[dict]:
     return [
@@ -42,40 +89,172 @@ def _inject_tags_into_prompt(base: str) -> str:
     return base + guidance
 
 
-def get_definitions(input_text: str, user_id: int, effort_override: str | None = None) -> WordList:
-    logger.info(f"Input: {input_text}")
+_ENTRY_SEPARATOR_RE = re.compile(r"[,;\n]+")
+_WHITESPACE_RE = re.compile(r"\s+")
 
+def split_entries(input_text: str) -> list[str]:
+    """Split a message listing several words (comma, semicolon or newline separated)."""
+    entries = (_WHITESPACE_RE.sub(" ", entry).strip() for entry in _ENTRY_SEPARATOR_RE.split(input_text))
+    return [entry for entry in entries if entry]
+
+def normalize_input(input_text: str) -> str:
+    """
+    Collapse whitespace and drop repeated entries from a word list.
+    Phrases and articles are kept as typed, since they change the meaning.
+    """
+    unique = {}
+    for entry in split_entries(input_text):
+        unique.setdefault(entry.lower(), entry)
+    return ", ".join(unique.values())
+
+def _cache_key(*parts: str) -> str:
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+def _prompt_version(prompt: str) -> str:
+    # Changing a prompt invalidates the responses cached for it
+    return hashlib.sha256(prompt.encode()).hexdigest()[:12]
+
+GET_DEFINITIONS_PROMPT: Final[str] = _inject_tags_into_prompt(GET_DEFINITIONS_PROMPT_BASE)
+GET_DEFINITIONS_PROMPT_VERSION: Final[str] = _prompt_version(GET_DEFINITIONS_PROMPT)
+EXTRACT_WORDS_PROMPT_VERSION: Final[str] = _prompt_version(EXTRACT_WORDS_PROMPT)
+
+
+def _definitions_request(input_text: str, user_id: int, effort_override: str | None) -> tuple[str, dict]:
+    """Build the cache key and responses.parse arguments for a definitions lookup."""
     config = get_user_config(user_id)
     effort = effort_override or config.effort
+    input_text = normalize_input(input_text) or input_text
 
-    client = OpenAI(api_key=OPENAI_API_KEY)
-    prompt = _inject_tags_into_prompt(GET_DEFINITIONS_PROMPT_BASE)
-    response = client.responses.parse(
-        model=config.model,
-        reasoning={ 'effort': effort },
-        text_format=WordList,
-        instructions=prompt,
-        input=input_text,
-    )
+    key = _cache_key("definitions", config.model, effort, GET_DEFINITIONS_PROMPT_VERSION, input_text.strip().lower())
+    params = {
+        "model": config.model,
+        "reasoning": { 'effort': effort },
+        "text_format": WordList,
+        "instructions": GET_DEFINITIONS_PROMPT,
+        "input": input_text,
+        # Byte-identical instructions plus a stable key let the API reuse the cached prompt prefix
+        "prompt_cache_key": f"definitions-{GET_DEFINITIONS_PROMPT_VERSION}",
+    }
+    return key, params
 
-    result = response.output_parsed
+def _cached_definitions(key: str, input_text: str) -> WordList | None:
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info(f"cache_hit definitions: {input_text}")
+        return WordList.model_validate_json(cached)
+    logger.info(f"cache_miss definitions: {input_text}")
+    return None
 
+def _store_definitions(key: str, result: WordList) -> WordList:
     if hasattr(result, 'words') and result.words:
         for word in result.words:
             logger.info(f"Output: {word.dutch} - {word.translation}")
+        # Only cache useful answers, so a failed parse is retried next time
+        cache.put(key, result.model_dump_json(), DEFINITIONS_CACHE_TTL)
 
     return result
 
-GENERATE_TAGS_PROMPT_BASE = load_prompt("generate_tags_prompt.md")
 
-def generate_tags(word: Word, user_id: int) -> list[str]:
-    logger.info(f"Generating tags for: {word.dutch}")
+def get_definitions(input_text: str, user_id: int, effort_override: str | None = None,
+                    use_cache: bool = True) -> WordList:
+    logger.info(f"Input: {input_text}")
 
-    config = get_user_config(user_id)
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    key, params = _definitions_request(input_text, user_id, effort_override)
+    if use_cache:
+        cached = _cached_definitions(key, input_text)
+        if cached is not None:
+            return cached
+
+    response = _get_client().responses.parse(**params)
+    return _store_definitions(key, response.output_parsed)
+
+async def aget_definitions(input_text: str, user_id: int, effort_override: str | None = None,
+                           use_cache: bool = True,
+                           on_word: Callable[[Word], Awaitable[None]] | None = None) -> WordList:
+    """
+    Async version of get_definitions for callers running on an event loop.
+    When on_word is given, the response is streamed and on_word is awaited for
+    each word as soon as it is complete, before the whole list has arrived.
+    """
+    logger.info(f"Input: {input_text}")
+
+    key, params = _definitions_request(input_text, user_id, effort_override)
+    if use_cache:
+        cached = _cached_definitions(key, input_text)
+        if cached is None and key in _inflight:
+            # Same lookup already running: wait for it instead of calling the API again
+            logger.info(f"Joining in-flight definitions request: {input_text}")
+            cached = await asyncio.shield(_inflight[key])
+        if cached is not None:
+            if on_word:
+                for word in cached.words:
+                    await on_word(word)
+            return cached
+
+    listening = True
+
+    async def emit(word: Word):
+        # Once this caller is cancelled the fetch carries on for the joiners, silently
+        if listening:
+            await on_word(word)
+
+    # Run the request in its own task, so cancelling this caller doesn't cancel the joiners
+    task = asyncio.create_task(_fetch_definitions(key, params, emit if on_word else None))
+    _inflight[key] = task
+    task.add_done_callback(lambda done: _forget_inflight(key, done))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        listening = False
+        raise
+
+def _forget_inflight(key: str, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # Mark the error as retrieved in case nobody is awaiting the task anymore
+    if not task.cancelled():
+        task.exception()
+
+async def _fetch_definitions(key: str, params: dict,
+                             on_word: Callable[[Word], Awaitable[None]] | None) -> WordList:
+    if not on_word:
+        response = await _get_async_client().responses.parse(**params)
+        return _store_definitions(key, response.output_parsed)
 
-    # Build prompt with allowed tags, similar to get_definitions
-    prompt = GENERATE_TAGS_PROMPT_BASE.replace("{{TAGS_ALL}}", ", ".join(TAGS_ALL))
+    emitted = 0
+    async with _get_async_client().responses.stream(**params) as stream:
+        async for event in stream:
+            if event.type != "response.output_text.delta":
+                continue
+            # Early snapshots may not parse yet (e.g. empty); the final response has every word
+            try:
+                partial = from_json(event.snapshot, allow_partial=True)
+            except ValueError:
+                continue
+            if not isinstance(partial, dict):
+                continue
+            # Every word but the last one in the partial JSON is complete
+            words = partial.get("words") or []
+            for data in words[emitted:-1]:
+                await on_word(Word.model_validate(data))
+                emitted += 1
+        response = await stream.get_final_response()
+
+    result = response.output_parsed
+    if result and result.words:
+        for word in result.words[emitted:]:
+            await on_word(word)
+    return _store_definitions(key, result)
+
+GENERATE_TAGS_PROMPT_BASE: Final[str] = load_prompt("generate_tags_prompt.md")
+
+# Build prompt with allowed tags once, similar to get_definitions
+GENERATE_TAGS_PROMPT: Final[str] = GENERATE_TAGS_PROMPT_BASE.replace("{{TAGS_ALL}}", ", ".join(TAGS_ALL))
+GENERATE_TAGS_PROMPT_VERSION: Final[str] = _prompt_version(GENERATE_TAGS_PROMPT)
+
+def _tags_request(word: Word, user_id: int) -> dict:
+    """Build the responses.parse params for tagging a word."""
+    config = get_user_config(user_id)
 
     # Create a JSON object with the word's details for the prompt
     input_data = {
@@ -84,37 +263,86 @@ def generate_tags(word: Word, user_id: int) -> list[str]:
         "definition_nl": word.definition_nl,
         "definition_en": word.definition_en,
     }
-    input_text = json.dumps(input_data, indent=2)
-
-    response = client.responses.parse(
-        model=config.model,
-        reasoning={'effort': 'low'},  # Tagging is a low-effort task
-        text_format=WordTags,
-        instructions=prompt,
-        input=input_text,
-    )
+    input_text = orjson.dumps(input_data, option=orjson.OPT_INDENT_2).decode()
 
-    result = response.output_parsed
-    
+    return {
+        "model": config.model,
+        "reasoning": {'effort': 'low'},  # Tagging is a low-effort task
+        "text_format": WordTags,
+        "instructions": GENERATE_TAGS_PROMPT,
+        "input": input_text,
+        "prompt_cache_key": f"tags-{GENERATE_TAGS_PROMPT_VERSION}",
+    }
+
+def _parsed_tags(word: Word, result: WordTags | None) -> list[str]:
     if result and result.tags:
         logger.info(f"Generated tags for '{word.dutch}': {result.tags}")
         return result.tags
-    
+
     logger.warning(f"Could not generate tags for '{word.dutch}'")
     return []
 
+def generate_tags(word: Word, user_id: int) -> list[str]:
+    logger.info(f"Generating tags for: {word.dutch}")
+
+    response = _get_client().responses.parse(**_tags_request(word, user_id))
+    return _parsed_tags(word, response.output_parsed)
+
+async def agenerate_tags(word: Word, user_id: int) -> list[str]:
+    """Async version of generate_tags."""
+    logger.info(f"Generating tags for: {word.dutch}")
+
+    response = await _get_async_client().responses.parse(**_tags_request(word, user_id))
+    return _parsed_tags(word, response.output_parsed)
+
+
 
+def _extract_words_key(input_text: str) -> str:
+    return _cache_key("extract_words", OPENAI_MODEL, OPENAI_MODEL_EFFORT, EXTRACT_WORDS_PROMPT_VERSION, input_text.strip().lower())
+
+def _cached_extract_words(key: str) -> list[str] | None:
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info("cache_hit extract_words")
+        return orjson.loads(cached)
+    logger.info("cache_miss extract_words")
+    return None
+
+def _store_extract_words(key: str, output_text: str) -> list[str]:
+    words = output_text.split('; ')
+    cache.put(key, orjson.dumps(words).decode(), EXTRACT_WORDS_CACHE_TTL)
+    return words
 
 def extract_words(input_text: str) -> list[str]:
+    key = _extract_words_key(input_text)
+    cached = _cached_extract_words(key)
+    if cached is not None:
+        return cached
+
+    messages = build_prompt(EXTRACT_WORDS_PROMPT, input_text)
+    response = _get_client().responses.create(
+        model=OPENAI_MODEL,
+        input=messages,
+        reasoning={ 'effort': OPENAI_MODEL_EFFORT }
+    )
+
+    return _store_extract_words(key, response.output_text)
+
+async def aextract_words(input_text: str) -> list[str]:
+    """Async version of extract_words."""
+    key = _extract_words_key(input_text)
+    cached = _cached_extract_words(key)
+    if cached is not None:
+        return cached
+
     messages = build_prompt(EXTRACT_WORDS_PROMPT, input_text)
-    client = OpenAI(api_key=OPENAI_API_KEY)
-    response = client.responses.create(
+    response = await _get_async_client().responses.create(
         model=OPENAI_MODEL,
         input=messages,
         reasoning={ 'effort': OPENAI_MODEL_EFFORT }
     )
 
-    return response.output_text.split('; ')
+    return _store_extract_words(key, response.output_text)
 
 
 if __name__ == "__main__":
@@ -1,25 +1,104 @@
-import sys
+import argparse
+import asyncio
+import functools
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Iterable
 from dotenv import load_dotenv
-from chatgpt import get_definitions, generate_tags
-from anki import sync_anki
-from word import Word, WordList
-from word_service import WordService
-from backfill import export_anki_to_db, export_db_to_anki
+from tqdm import tqdm
+from word import Word
+
+if TYPE_CHECKING:
+    from word_service import WordService
 
 # Load environment variables from .env file
 load_dotenv()
 
+# The commands import openai/requests and the database layer lazily, so
+# `help` and typos don't pay for loading them
+
+# Words sent to ChatGPT per regenerate request
+REGENERATE_BATCH_SIZE = 20
+
+# Word changes written to the database per transaction by the bulk commands
+BULK_WRITE_SIZE = 50
+
+# How long the bulk writer waits for a batch to fill up before writing what it has
+BULK_WRITE_WINDOW_SECONDS = 2.0
+
+@functools.lru_cache(maxsize=1)
+def get_word_service() -> "WordService":
+    """Return the WordService shared by all commands in this process."""
+    from word_service import WordService
+    return WordService()
+
+def unique_words(words: Iterable[Word]) -> list[Word]:
+    """Drop words without Dutch text and repeats that only differ by case/spacing."""
+    unique = {}
+    for word in words:
+        key = (word.dutch or "").strip().lower()
+        if key and key not in unique:
+            unique[key] = word
+    return list(unique.values())
+
+def apply_pending(word_service: "WordService", pending: list[tuple[str, list]]) -> list[str]:
+    """
+    Apply the queued (dutch, ops) results from a bulk command in one transaction.
+    Returns the Dutch words that could not be saved.
+    """
+    if not pending:
+        return []
+
+    ops = [op for _, word_ops in pending for op in word_ops]
+    try:
+        total_saved, total_synced = word_service.apply_bulk(ops)
+    except Exception as e:
+        tqdm.write(f"✗ Failed to save {len(pending)} words: {e}")
+        return [dutch for dutch, _ in pending]
+    finally:
+        pending.clear()
+
+    tqdm.write(f"Saved {total_saved} words, synced {total_synced} to Anki")
+    return []
+
+async def write_pending(word_service: "WordService", queue: asyncio.Queue) -> list[str]:
+    """
+    Writer stage of the bulk commands: collects (dutch, ops) items from queue
+    until BULK_WRITE_SIZE of them or BULK_WRITE_WINDOW_SECONDS have passed, and
+    applies them in one transaction while the ChatGPT calls keep running.
+    Stops at a None item.
+    Returns the Dutch words that could not be saved.
+    """
+    loop = asyncio.get_running_loop()
+    unsaved = []
+    done = False
+    while not done:
+        pending = [await queue.get()]
+        deadline = loop.time() + BULK_WRITE_WINDOW_SECONDS
+        while pending[-1] is not None and len(pending) < BULK_WRITE_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                pending.append(await asyncio.wait_for(queue.get(), remaining))
+            except TimeoutError:
+                break
+        if pending[-1] is None:
+            pending.pop()
+            done = True
+        unsaved.extend(await asyncio.to_thread(apply_pending, word_service, pending))
+    return unsaved
+
 def add_word_to_anki(user_input: str) -> list[Word]:
     """
     Main logic:
     1. Send user input to ChatGPT for definitions.
     2. Save words to database and sync to Anki via WordService.
-    3. Sync with AnkiWeb.
+    3. Add the notes and sync with AnkiWeb in one AnkiConnect request (done by create_many).
     4. Return the definitions as Word objects.
     """
-    word_service = WordService()
+    from chatgpt import get_definitions
+
+    word_service = get_word_service()
     response = get_definitions(user_input, user_id=0)  # Default user ID for CLI
 
     if response.words:
@@ -27,9 +106,6 @@ def add_word_to_anki(user_input: str) -> list[Word]:
         total_saved, total_synced = word_service.create_many(response.words)
         print(f"Saved {total_saved}/{len(response.words)} words, synced {total_synced}/{len(response.words)} to Anki")
 
-        # Sync with AnkiWeb
-        sync_anki()
-
     return response.words
 
 def cmd_add():
@@ -43,19 +119,23 @@ def cmd_add():
 
 def cmd_import():
     """Import words from Anki to database."""
+    from backfill import export_anki_to_db
+
     print("Importing words from Anki to database...")
     success, total = export_anki_to_db()
     print(f"✅ Imported {success}/{total} words from Anki to database")
 
 def cmd_export():
     """Export words from database to Anki."""
+    from backfill import export_db_to_anki
+
     print("Exporting words from database to Anki...")
     success, total = export_db_to_anki()
     print(f"✅ Exported {success}/{total} words from database to Anki")
 
 def cmd_sync():
     """Sync all words in database to Anki."""
-    word_service = WordService()
+    word_service = get_word_service()
     print("Syncing all words to Anki...")
     result = word_service.sync_all_to_anki()
 
@@ -64,15 +144,19 @@ def cmd_sync():
     else:
         print(f"❌ Sync failed: {result.get('error')}")
 
-def cmd_regenerate():
+def cmd_regenerate(batch: int = REGENERATE_BATCH_SIZE, concurrency: int | None = None):
     """Regenerate all words in the database, skipping words that already have a level."""
-    word_service = WordService()
-    all_words = word_service.get_all()
+    from chatgpt import aget_definitions, split_entries, close_async_client
+    from concurrency import AdaptiveLimiter
+    from config import MAX_CONCURRENCY
+
+    concurrency = concurrency or MAX_CONCURRENCY
 
-    # Filter words that don't have a level yet
-    words_to_regenerate = [word for word in all_words if not word.level or word.level.strip() == '']
+    word_service = get_word_service()
+    # Only load the words that don't have a level yet
+    words_to_regenerate = unique_words(word_service.get_without_level())
 
-    total = len(all_words)
+    total = word_service.count()
     to_regenerate_count = len(words_to_regenerate)
     skipped_count = total - to_regenerate_count
 
@@ -85,66 +169,112 @@ def cmd_regenerate():
         return
 
     # Ask for confirmation
-    response = input(f"\nProceed with regenerating {to_regenerate_count} words in batches of 10? (y/n): ")
+    response = input(f"\nProceed with regenerating {to_regenerate_count} words in batches of {batch}? (y/n): ")
     if response.lower() != 'y':
         print("Cancelled.")
         return
 
-    print("\nStarting regeneration (batches of 10)...")
+    print(f"\nStarting regeneration (batches of {batch})...")
     success_count = 0
     failed_words = []
-    completed_count = 0
 
-    def regenerate_word(word):
+    def normalize(dutch):
+        return (dutch or "").strip().lower()
+
+    def regenerated(word, new_word):
+        """Build the database operations that replace the original with the regenerated word."""
+        # If GPT returns a different Dutch word, delete the original
+        # before adding the new one to avoid duplicates.
+        old_norm = normalize(word.dutch)
+        new_norm = normalize(new_word.dutch)
+        if new_norm and new_norm != old_norm:
+            # Delete original entry (and its Anki note if synced), then create the new one
+            ops = [("delete", word), ("save", new_word)]
+        else:
+            # Same Dutch term: update in place
+            ops = [("save", new_word)]
+        return (True, new_word.dutch, new_word.level, ops)
+
+    limiter = None
+
+    async def fetch_definitions(user_input):
+        async with limiter:
+            return await aget_definitions(user_input, user_id=0, use_cache=False)
+
+    async def regenerate_word(word):
         """Regenerate a single word and return result."""
         try:
-            result = get_definitions(word.dutch, user_id=0)
+            result = await fetch_definitions(word.dutch)
             if result.words and len(result.words) > 0:
-                new_word = result.words[0]
-                # If GPT returns a different Dutch word, delete the original
-                # before adding the new one to avoid duplicates.
-                try:
-                    old_norm = (word.dutch or "").strip().lower()
-                    new_norm = (new_word.dutch or "").strip().lower()
-                    if new_norm and new_norm != old_norm:
-                        # Delete original entry (and its Anki note if synced)
-                        word_service.delete(word.dutch)
-                        # Create the regenerated word as a new entry
-                        _, _ = word_service.create(new_word)
-                        return (True, new_word.dutch, new_word.level)
-                    else:
-                        # Same Dutch term: update in place
-                        _, _ = word_service.update(new_word)
-                        return (True, new_word.dutch, new_word.level)
-                except Exception as inner_e:
-                    return (False, word.dutch, f"Post-process error: {inner_e}")
+                return regenerated(word, result.words[0])
             else:
-                return (False, word.dutch, "No data returned")
+                return (False, word.dutch, "No data returned", [])
         except Exception as e:
-            return (False, word.dutch, str(e))
-
-    # Process in batches of 10
-    batch_size = 10
-    with ThreadPoolExecutor(max_workers=batch_size) as executor:
-        # Submit all tasks
-        future_to_word = {executor.submit(regenerate_word, word): word for word in words_to_regenerate}
-
-        # Process results as they complete
-        for future in as_completed(future_to_word):
-            word = future_to_word[future]
-            completed_count += 1
-
+            return (False, word.dutch, str(e), [])
+
+    async def regenerate_batch(words):
+        """
+        Regenerate several words with one ChatGPT request.
+        Words that can't be matched back to the response by their Dutch form
+        (e.g. GPT changed the headword) are retried one by one.
+        """
+        # Entries containing a separator would be split apart in the joined prompt
+        batchable = [word for word in words if split_entries(word.dutch or "") == [word.dutch]]
+        generated = {}
+        if len(batchable) > 1:
             try:
-                success, dutch, info = future.result()
-                if success:
-                    success_count += 1
-                    print(f"[{completed_count}/{to_regenerate_count}] ✓ {dutch} (level: {info or 'none'})")
-                else:
-                    failed_words.append(dutch)
-                    print(f"[{completed_count}/{to_regenerate_count}] ✗ {dutch} - {info}")
+                result = await fetch_definitions(", ".join(word.dutch for word in batchable))
+                generated = {normalize(new_word.dutch): new_word for new_word in result.words}
             except Exception as e:
-                failed_words.append(word.dutch)
-                print(f"[{completed_count}/{to_regenerate_count}] ✗ {word.dutch} - Error: {e}")
+                logging.warning(f"Batch regeneration failed, retrying words one by one: {e}")
+
+        results = []
+        for word in words:
+            new_word = generated.pop(normalize(word.dutch), None)
+            if new_word is not None:
+                results.append(regenerated(word, new_word))
+            else:
+                results.append(await regenerate_word(word))
+        return results
+
+    batches = [
+        words_to_regenerate[i:i + batch]
+        for i in range(0, to_regenerate_count, batch)
+    ]
+
+    async def run():
+        nonlocal limiter, success_count
+        # Ramps up while the API keeps up, backs off on 429/5xx
+        limiter = AdaptiveLimiter(maximum=concurrency)
+        # The bar redraws a few times per second instead of printing a line per word
+        progress = tqdm(total=to_regenerate_count, unit="word")
+
+        # Tasks only talk to ChatGPT; results go through a bounded queue to the writer
+        writes = asyncio.Queue(maxsize=2 * BULK_WRITE_SIZE)
+        writer = asyncio.create_task(write_pending(word_service, writes))
+        try:
+            # Process batches as they complete
+            for next_results in asyncio.as_completed([regenerate_batch(batch) for batch in batches]):
+                for success, dutch, info, ops in await next_results:
+                    if success:
+                        success_count += 1
+                        await writes.put((dutch, ops))
+                    else:
+                        failed_words.append(dutch)
+                        progress.write(f"✗ {dutch} - {info}")
+                    progress.set_postfix(last=dutch, ok=success_count, refresh=False)
+                    progress.update(1)
+
+            await writes.put(None)
+            unsaved = await writer
+            success_count -= len(unsaved)
+            failed_words.extend(unsaved)
+        finally:
+            writer.cancel()
+            progress.close()
+            await close_async_client()
+
+    asyncio.run(run())
 
     print(f"\n{'='*60}")
     print(f"Regeneration complete!")
@@ -155,23 +285,29 @@ def cmd_regenerate():
         print(f"\nFailed words: {', '.join(failed_words)}")
 
 
-def cmd_generate_tags():
+def cmd_generate_tags(force: bool = False, concurrency: int | None = None):
     """Generate tags for words in the database."""
-    word_service = WordService()
-    all_words = word_service.get_all()
+    from chatgpt import agenerate_tags, close_async_client
+    from concurrency import AdaptiveLimiter
+    from config import MAX_CONCURRENCY
+
+    concurrency = concurrency or MAX_CONCURRENCY
+
+    word_service = get_word_service()
+    total = word_service.count()
     
-    force_all = '--force' in sys.argv
+    force_all = force
     
     if force_all:
-        words_to_tag = all_words
+        words_to_tag = unique_words(word_service.iter_all())
         skipped_count = 0
     else:
-        words_to_tag = [word for word in all_words if not word.tags]
-        skipped_count = len(all_words) - len(words_to_tag)
+        words_to_tag = unique_words(word_service.get_without_tags())
+        skipped_count = total - len(words_to_tag)
 
     total_to_tag = len(words_to_tag)
 
-    print(f"Found {len(all_words)} total words:")
+    print(f"Found {total} total words:")
     print(f"  - {total_to_tag} words to tag")
     if not force_all:
         print(f"  - {skipped_count} words to skip (already have tags)")
@@ -180,47 +316,76 @@ def cmd_generate_tags():
         print("✅ No words to tag!")
         return
 
-    response = input(f"\nProceed with generating tags for {total_to_tag} words in batches of 10? (y/n): ")
+    response = input(f"\nProceed with generating tags for {total_to_tag} words (up to {concurrency} at a time)? (y/n): ")
     if response.lower() != 'y':
         print("Cancelled.")
         return
         
-    print("\nStarting tag generation (batches of 10)...")
+    print(f"\nStarting tag generation (up to {concurrency} at a time)...")
     success_count = 0
     failed_words = []
-    completed_count = 0
 
-    def process_word_tags(word):
-        """Generate and update tags for a single word."""
+    limiter = None
+
+    async def process_word_tags(word):
+        """Generate tags for a single word."""
         try:
-            tags = generate_tags(word, user_id=0)
+            async with limiter:
+                tags = await agenerate_tags(word, user_id=0)
             if tags:
                 word.tags = tags
-                _, _ = word_service.update(word)
-                return (True, word.dutch, ", ".join(tags))
+                return (True, word, ", ".join(tags))
             else:
-                return (False, word.dutch, "No tags generated")
+                return (False, word, "No tags generated")
         except Exception as e:
-            return (False, word.dutch, str(e))
+            return (False, word, str(e))
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        future_to_word = {executor.submit(process_word_tags, word): word for word in words_to_tag}
+    async def run():
+        nonlocal limiter, success_count
+        # Ramps up while the API keeps up, backs off on 429/5xx
+        limiter = AdaptiveLimiter(maximum=concurrency)
+        # The bar redraws a few times per second instead of printing a line per word
+        progress = tqdm(total=total_to_tag, unit="word")
+
+        # A fixed pool of workers pulls words from one iterator, so there's never
+        # more than `concurrency` tasks around however many words need tags
+        remaining = iter(words_to_tag)
+        results = asyncio.Queue()
+
+        async def worker():
+            for word in remaining:
+                await results.put(await process_word_tags(word))
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, total_to_tag))]
+
+        # Tagged words go through a bounded queue to the writer
+        writes = asyncio.Queue(maxsize=2 * BULK_WRITE_SIZE)
+        writer = asyncio.create_task(write_pending(word_service, writes))
+        try:
+            for _ in range(total_to_tag):
+                success, word, info = await results.get()
 
-        for future in as_completed(future_to_word):
-            word = future_to_word[future]
-            completed_count += 1
-            
-            try:
-                success, dutch, info = future.result()
                 if success:
                     success_count += 1
-                    print(f"[{completed_count}/{total_to_tag}] ✓ {dutch} (tags: {info})")
+                    await writes.put((word.dutch, [("save", word)]))
                 else:
-                    failed_words.append(dutch)
-                    print(f"[{completed_count}/{total_to_tag}] ✗ {dutch} - {info}")
-            except Exception as e:
-                failed_words.append(word.dutch)
-                print(f"[{completed_count}/{total_to_tag}] ✗ {word.dutch} - Error: {e}")
+                    failed_words.append(word.dutch)
+                    progress.write(f"✗ {word.dutch} - {info}")
+                progress.set_postfix(last=word.dutch, ok=success_count, refresh=False)
+                progress.update(1)
+
+            await writes.put(None)
+            unsaved = await writer
+            success_count -= len(unsaved)
+            failed_words.extend(unsaved)
+        finally:
+            for task in workers:
+                task.cancel()
+            writer.cancel()
+            progress.close()
+            await close_async_client()
+
+    asyncio.run(run())
 
     print(f"\n{'='*60}")
     print(f"Tag generation complete!")
@@ -232,50 +397,64 @@ def cmd_generate_tags():
         print(f"\nFailed words: {', '.join(failed_words)}")
 
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="anki-gpt-cli")
+    commands = parser.add_subparsers(dest="command", title="commands", metavar="command")
+
+    commands.add_parser("add", help="Add words via ChatGPT (interactive)")
+    commands.add_parser("import", help="Import words from Anki to database")
+    commands.add_parser("export", help="Export words from database to Anki")
+    commands.add_parser("sync", help="Sync all database words to Anki")
+
+    regenerate = commands.add_parser("regenerate", help="Regenerate all words without a level")
+    regenerate.add_argument("--batch", type=positive_int, default=REGENERATE_BATCH_SIZE,
+                            help=f"words per ChatGPT request (default: {REGENERATE_BATCH_SIZE})")
+    regenerate.add_argument("--concurrency", type=positive_int,
+                            help="max concurrent ChatGPT requests (default: ANKI_GPT_MAX_CONCURRENCY)")
+
+    generate_tags = commands.add_parser("generate-tags", help="Generate tags for words without them")
+    generate_tags.add_argument("--force", action="store_true", help="regenerate tags for all words")
+    generate_tags.add_argument("--concurrency", type=positive_int,
+                               help="max concurrent ChatGPT requests (default: ANKI_GPT_MAX_CONCURRENCY)")
+
+    commands.add_parser("help", help="Show this help message")
+    return parser
+
 def cmd_help():
     """Show help message."""
-    print("Usage: anki-gpt-cli [command]")
-    print("\nCommands:")
-    print("  add              Add words via ChatGPT (interactive)")
-    print("  import           Import words from Anki to database")
-    print("  export           Export words from database to Anki")
-    print("  sync             Sync all database words to Anki")
-    print("  regenerate       Regenerate all words without a level")
-    print("  generate-tags    Generate tags for words without them")
-    print("  help             Show this help message")
+    build_parser().print_help()
+
+COMMANDS = {
+    "add": cmd_add,
+    "import": cmd_import,
+    "export": cmd_export,
+    "sync": cmd_sync,
+    "regenerate": cmd_regenerate,
+    "generate-tags": cmd_generate_tags,
+    "help": cmd_help,
+}
 
 def main():
     """CLI entry point for anki-gpt-cli command."""
-    if len(sys.argv) < 2:
+    options = vars(build_parser().parse_args())
+    command = options.pop("command")
+    if command is None:
         cmd_help()
         return
 
-    command = sys.argv[1]
-
     # Configure logging
     logging.basicConfig(
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         level=logging.INFO
     )
 
-    if command == "add":
-        cmd_add()
-    elif command == "import":
-        cmd_import()
-    elif command == "export":
-        cmd_export()
-    elif command == "sync":
-        cmd_sync()
-    elif command == "regenerate":
-        cmd_regenerate()
-    elif command == "generate-tags":
-        cmd_generate_tags()
-    elif command == "help":
-        cmd_help()
-    else:
-        print(f"Unknown command: {command}")
-        print("Run 'anki-gpt-cli help' for usage information")
-        sys.exit(1)
+    COMMANDS[command](**options)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,61 @@
+"""
+Adaptive concurrency limit for bulk ChatGPT runs.
+
+Starts low and adds one slot after every `limit` successful calls; halves the
+limit when the API answers with rate limit or server errors (AIMD), so long
+runs settle near what the account's rate limit actually allows.
+"""
+import asyncio
+import logging
+
+from openai import APIStatusError
+
+logger = logging.getLogger(__name__)
+
+
+def _is_overload(exc: BaseException | None) -> bool:
+    """Rate limited (429) or server side (5xx) errors mean we should back off."""
+    return isinstance(exc, APIStatusError) and (exc.status_code == 429 or exc.status_code >= 500)
+
+
+class AdaptiveLimiter:
+    """Async context manager that gates calls by an adjustable concurrency limit."""
+
+    def __init__(self, initial: int = 4, maximum: int = 32):
+        self.maximum = max(1, maximum)
+        self.limit = max(1, min(initial, self.maximum))
+        self._active = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._condition:
+            self._active -= 1
+            if _is_overload(exc):
+                self._decrease()
+            elif exc is None:
+                self._increase()
+            self._condition.notify_all()
+
+    def _increase(self) -> None:
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.maximum:
+            self._successes = 0
+            self.limit += 1
+            logger.debug(f"Concurrency raised to {self.limit}")
+
+    def _decrease(self) -> None:
+        # Only the first error of a burst halves the limit; calls that were
+        # already in flight at the old limit would otherwise keep halving it
+        if self._successes < 0:
+            self._successes += 1
+            return
+        self.limit = max(1, self.limit // 2)
+        self._successes = -self._active
+        logger.warning(f"API overloaded, concurrency lowered to {self.limit}")
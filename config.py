@@ -1,15 +1,18 @@
 import os
 from typing import Optional
 
+_TRUE_VALUES = frozenset({"true", "yes", "1"})
+_FALSE_VALUES = frozenset({"false", "no", "0"})
+
 def get_env_bool(key: str, default: bool = False) -> bool:
     """
     Get a boolean value from environment variables.
     Accepts: true, yes, 1 (case-insensitive) as True.
     """
     value = os.getenv(key, "").lower()
-    if value in ("true", "yes", "1"):
+    if value in _TRUE_VALUES:
         return True
-    if value in ("false", "no", "0"):
+    if value in _FALSE_VALUES:
         return False
     return default
 
@@ -19,3 +22,10 @@ ANKI_CONNECT_URL = os.getenv("ANKI_CONNECT_URL", "http://localhost:8765")
 
 # Database configuration
 DATABASE_PATH = os.getenv("DATABASE_PATH", "words.db")
+
+# ChatGPT response cache configuration (seconds)
+DEFINITIONS_CACHE_TTL = int(os.getenv("DEFINITIONS_CACHE_TTL", "2592000"))
+EXTRACT_WORDS_CACHE_TTL = int(os.getenv("EXTRACT_WORDS_CACHE_TTL", "300"))
+
+# Upper bound for concurrent ChatGPT requests in bulk CLI commands
+MAX_CONCURRENCY = int(os.getenv("ANKI_GPT_MAX_CONCURRENCY", "20"))
@@ -1,28 +1,179 @@
+import re
 import sqlite3
-import json
+import orjson
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 from word import Word
 import bleach
 
+# Max bound parameters per IN (...) lookup, well under SQLite's variable limit
+SQL_VARIABLES_CHUNK = 500
+
+# Stored in PRAGMA user_version once init_database has set up the file; bump it
+# when changing the schema or adding a migration so existing databases rerun it
+SCHEMA_VERSION = 3
+
+# Sorts after any character, so [q, q + _MAX_CHAR) covers every string starting with q
+_MAX_CHAR = "\U0010ffff"
+
+# Decoded words kept per (dutch, updated_at); every write bumps updated_at, so a
+# changed row just misses and its old entry ages out
+WORD_CACHE_SIZE = 4096
+_LIST_FIELDS = ('collocations', 'synonyms', 'examples_nl', 'examples_en', 'related', 'tags')
+
+# Column order of the tuples built by WordDatabase._word_to_row
+_WORD_COLUMNS = (
+    'dutch', 'translation', 'definition_nl', 'definition_en', 'pronunciation', 'grammar',
+    'collocations', 'synonyms', 'examples_nl', 'examples_en', 'etymology', 'related',
+    'tags', 'level', 'score',
+)
+
+# Statements are built once so SQLite's statement cache can reuse them.
+# The upsert takes the row followed by the updated_at timestamp, which new rows get too.
+# words.updated_at stays a Python microsecond timestamp: it keys the decoded-word cache.
+_UPSERT_WORD_SQL = (
+    f"INSERT INTO words ({', '.join(_WORD_COLUMNS)}, updated_at) "
+    f"VALUES ({', '.join('?' * (len(_WORD_COLUMNS) + 1))}) "
+    f"ON CONFLICT(dutch) DO UPDATE SET "
+    f"{', '.join(f'{column} = excluded.{column}' for column in _WORD_COLUMNS[1:])}, updated_at = excluded.updated_at"
+)
+# Local time in datetime.isoformat() layout (millisecond precision), computed by SQLite
+_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+# Records a sync for the word with the given dutch text; does nothing if it doesn't exist.
+# Takes (anki_note_id, deck_name, dutch).
+_MARK_SYNCED_SQL = f"""
+    INSERT INTO anki_words (word_id, anki_note_id, deck_name, synced_at, last_updated_at, sync_count)
+    SELECT id, ?, ?, {_NOW_SQL}, {_NOW_SQL}, 1 FROM words WHERE dutch = ?
+    ON CONFLICT(word_id) DO UPDATE SET
+        anki_note_id = excluded.anki_note_id,
+        deck_name = excluded.deck_name,
+        last_updated_at = excluded.last_updated_at,
+        sync_count = sync_count + 1
+"""
+# Current words schema, shared by init_database and the legacy-column rebuild.
+# Older databases reach it through the _migrate_* steps.
+_CREATE_WORDS_SQL = """
+    CREATE TABLE IF NOT EXISTS words (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        dutch TEXT NOT NULL,
+        translation TEXT NOT NULL,
+        definition_nl TEXT NOT NULL,
+        definition_en TEXT NOT NULL,
+        pronunciation TEXT NOT NULL,
+        grammar TEXT NOT NULL,
+        collocations BLOB NOT NULL,  -- JSON array
+        synonyms BLOB NOT NULL,      -- JSON array
+        examples_nl BLOB NOT NULL,   -- JSON array
+        examples_en BLOB NOT NULL,   -- JSON array
+        etymology TEXT NOT NULL,
+        related BLOB NOT NULL,       -- JSON array
+        level TEXT DEFAULT '',       -- Difficulty level
+        tags TEXT DEFAULT '[]',      -- JSON array
+        score INTEGER DEFAULT 1,
+        is_synced INTEGER NOT NULL DEFAULT 0,  -- Mirrors anki_words.synced_at, set by triggers
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(dutch)
+    )
+"""
+# Run by init_database before the migrations (after _CREATE_WORDS_SQL)
+_CREATE_TABLES_SQL = f"""
+    {_CREATE_WORDS_SQL};
+
+    -- Anki synchronization data
+    CREATE TABLE IF NOT EXISTS anki_words (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        word_id INTEGER NOT NULL,
+        anki_note_id INTEGER,
+        deck_name TEXT DEFAULT 'Default',
+        synced_at TIMESTAMP,
+        last_updated_at TIMESTAMP,
+        sync_count INTEGER DEFAULT 0,
+        reviews INTEGER,
+        lapses INTEGER,
+        ease_factor INTEGER,
+        interval INTEGER,
+        due INTEGER,
+        FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE,
+        UNIQUE(word_id)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_dutch ON words(dutch);
+    CREATE INDEX IF NOT EXISTS idx_created_at ON words(created_at);
+    CREATE INDEX IF NOT EXISTS idx_word_id ON anki_words(word_id);
+    CREATE INDEX IF NOT EXISTS idx_anki_note_id ON anki_words(anki_note_id);
+    CREATE INDEX IF NOT EXISTS idx_synced_at ON anki_words(synced_at);
+"""
+# Run by init_database after the migrations, since level, tags and is_synced are
+# added to older databases there
+_CREATE_DERIVED_SQL = """
+    -- Partial indexes for the "missing level/tags" and "unsynced" queries
+    CREATE INDEX IF NOT EXISTS idx_words_no_level ON words(created_at)
+    WHERE level IS NULL OR TRIM(level) = '';
+    CREATE INDEX IF NOT EXISTS idx_words_no_tags ON words(created_at)
+    WHERE tags IS NULL OR tags = '' OR tags = '[]';
+    CREATE INDEX IF NOT EXISTS idx_words_unsynced ON words(created_at) WHERE is_synced = 0;
+
+    -- Lets the viewer's translation sort read one page off an index
+    CREATE INDEX IF NOT EXISTS idx_translation_nocase ON words(translation COLLATE NOCASE);
+
+    -- Keep words.is_synced in step with the word's anki_words record
+    CREATE TRIGGER IF NOT EXISTS anki_words_sync_insert AFTER INSERT ON anki_words BEGIN
+        UPDATE words SET is_synced = (new.synced_at IS NOT NULL) WHERE id = new.word_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS anki_words_sync_update AFTER UPDATE OF synced_at ON anki_words BEGIN
+        UPDATE words SET is_synced = (new.synced_at IS NOT NULL) WHERE id = new.word_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS anki_words_sync_delete AFTER DELETE ON anki_words BEGIN
+        UPDATE words SET is_synced = 0 WHERE id = old.word_id;
+    END;
+"""
+_UPDATE_WORD_SQL = (
+    f"UPDATE words SET {', '.join(f'{column} = ?' for column in _WORD_COLUMNS)}, updated_at = ? WHERE id = ?"
+)
+
 # Allowed inline tags for safe HTML storage
 _ALLOWED_INLINE_TAGS = [
     "b", "i", "em", "strong", "u", "s", "sub", "sup", "code", "br",
 ]
 
 
+# Characters bleach escapes, strips or normalizes; text without any of them comes back unchanged
+_NEEDS_SANITIZING = re.compile(r"[<>&\x00-\x08\x0b-\x1f]")
+
+# bleach Cleaners are expensive to build and not thread-safe, so each thread keeps one
+_cleaners = threading.local()
+
+
+def _get_cleaner() -> bleach.sanitizer.Cleaner:
+    cleaner = getattr(_cleaners, "cleaner", None)
+    if cleaner is None:
+        cleaner = bleach.sanitizer.Cleaner(
+            tags=_ALLOWED_INLINE_TAGS,
+            attributes={},
+            protocols=[],
+            strip=True,
+            strip_comments=True,
+        )
+        _cleaners.cleaner = cleaner
+    return cleaner
+
+
 def _sanitize_inline_html(text: str) -> str:
     if text is None:
         return ""
-    return bleach.clean(
-        text,
-        tags=_ALLOWED_INLINE_TAGS,
-        attributes={},
-        protocols=[],
-        strip=True,
-        strip_comments=True,
-    )
+    if not _NEEDS_SANITIZING.search(text):
+        return text
+    return _clean_html(text)
+
+
+@lru_cache(maxsize=4096)
+def _clean_html(text: str) -> str:
+    return _get_cleaner().clean(text)
 
 
 def _sanitize_list_html(items: list[str]) -> list[str]:
@@ -31,88 +182,196 @@ def _sanitize_list_html(items: list[str]) -> list[str]:
 class WordDatabase:
     def __init__(self, db_path: str = "words.db"):
         self.db_path = Path(db_path)
+        # One long-lived connection per thread keeps the page cache warm between calls
+        self._local = threading.local()
+        # Connections handed back by threads that are done with them, see release()
+        self._idle: List[tuple] = []
+        self._idle_lock = threading.Lock()
+        self._word_cache: "OrderedDict[tuple, Word]" = OrderedDict()
+        self._word_cache_lock = threading.Lock()
         self.init_database()
 
     def _connect(self) -> sqlite3.Connection:
-        """Create a SQLite connection with foreign keys and Row factory enabled."""
-        conn = sqlite3.connect(self.db_path)
+        """
+        Return this thread's SQLite connection, opening it on first use with foreign
+        keys and Row factory enabled. Use it as `with self._connect() as conn:` so each
+        block commits (or rolls back) its own transaction.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        with self._idle_lock:
+            idle = self._idle.pop() if self._idle else None
+        if idle is not None:
+            self._local.conn, self._local.results = idle
+            return self._local.conn
+
+        # Connections can move between threads through release(), one owner at a time
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
         try:
             conn.execute("PRAGMA foreign_keys=ON")
+            # WAL (set once in init_database) only needs NORMAL sync to stay consistent
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            # 64 MB page cache, kept for the lifetime of the connection
+            conn.execute("PRAGMA cache_size=-65536")
         except sqlite3.OperationalError:
             pass
         conn.row_factory = sqlite3.Row
+        self._local.conn = conn
+        self._local.results = {}
         return conn
 
+    def release(self):
+        """
+        Hand the calling thread's connection to the next thread that needs one. For
+        short-lived threads (e.g. one per web request), so each doesn't open its own.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        with self._idle_lock:
+            self._idle.append((conn, self._local.results))
+        self._local.conn = None
+
+    def close(self):
+        """Close the calling thread's connection; the next call opens a new one."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
     def init_database(self):
         """Initialize the database and create tables if they don't exist."""
         with self._connect() as conn:
-            # Create words table (core word data)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS words (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    dutch TEXT NOT NULL,
-                    translation TEXT NOT NULL,
-                    definition_nl TEXT NOT NULL,
-                    definition_en TEXT NOT NULL,
-                    pronunciation TEXT NOT NULL,
-                    grammar TEXT NOT NULL,
-                    collocations TEXT NOT NULL,  -- JSON array
-                    synonyms TEXT NOT NULL,      -- JSON array
-                    examples_nl TEXT NOT NULL,   -- JSON array
-                    examples_en TEXT NOT NULL,   -- JSON array
-                    etymology TEXT NOT NULL,
-                    related TEXT NOT NULL,       -- JSON array
-                    level TEXT DEFAULT '',       -- Difficulty level
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(dutch)
-                )
-            """)
+            # Tables, indexes, triggers and migrations are all recorded in the file, so once
+            # user_version is current opening the database is this one read
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                cursor = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'words_fts'")
+                self._has_fts = cursor.fetchone() is not None
+                return
+
+            # WAL lets readers and the writer work concurrently; the mode is stored in the file
+            conn.execute("PRAGMA journal_mode=WAL")
+
+            # Create the tables and their lookup indexes in one transaction
+            conn.executescript(f"BEGIN; {_CREATE_TABLES_SQL} COMMIT;")
+
+            # Read the columns once; the migrations keep the sets current as they alter tables
+            words_columns = self._table_columns(conn, "words")
+            anki_columns = self._table_columns(conn, "anki_words")
 
-            # Create anki_words table (Anki synchronization data)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS anki_words (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    word_id INTEGER NOT NULL,
-                    anki_note_id INTEGER,
-                    deck_name TEXT DEFAULT 'Default',
-                    synced_at TIMESTAMP,
-                    last_updated_at TIMESTAMP,
-                    sync_count INTEGER DEFAULT 0,
-                    reviews INTEGER,
-                    lapses INTEGER,
-                    ease_factor INTEGER,
-                    interval INTEGER,
-                    due INTEGER,
-                    FOREIGN KEY (word_id) REFERENCES words(id) ON DELETE CASCADE,
-                    UNIQUE(word_id)
+            # Migrate legacy data and add missing columns in one transaction; the sqlite3
+            # module doesn't open one for ALTER TABLE, so each would otherwise commit on its own
+            with conn:
+                conn.execute("BEGIN")
+                self._migrate_legacy_anki_data(conn, words_columns)
+                self._migrate_add_anki_stats_columns(conn, anki_columns)
+                self._migrate_add_level_column(conn, words_columns)
+                self._migrate_add_tags_column(conn, words_columns)
+                self._migrate_add_score_column(conn, words_columns)
+
+            # Commits on its own, foreign keys can only be switched off outside a transaction
+            self._migrate_drop_legacy_anki_columns(conn, words_columns)
+
+            with conn:
+                conn.execute("BEGIN")
+                self._migrate_normalize_dutch(conn)
+                self._migrate_add_is_synced_column(conn, words_columns)
+
+            # Indexes and triggers on columns that older databases only get from the migrations
+            conn.executescript(f"BEGIN; {_CREATE_DERIVED_SQL} COMMIT;")
+
+            self._has_fts = self._create_search_index(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _create_search_index(self, conn) -> bool:
+        """
+        Create the words_fts full-text index used by search_words, kept in sync by triggers.
+
+        Uses the trigram tokenizer so matches stay substrings anywhere in a word, like the
+        LIKE search it replaces (Dutch compounds: "huis" finds "boerenhuis"). Returns False
+        if this SQLite build lacks FTS5 or trigram; search then falls back to LIKE.
+        """
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'words_fts'")
+        exists = cursor.fetchone() is not None
+
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS words_fts USING fts5(
+                    dutch, translation, definition_nl, definition_en,
+                    content='words', content_rowid='id', tokenize='trigram'
                 )
             """)
+        except sqlite3.OperationalError:
+            return False
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS words_fts_insert AFTER INSERT ON words BEGIN
+                INSERT INTO words_fts(rowid, dutch, translation, definition_nl, definition_en)
+                VALUES (new.id, new.dutch, new.translation, new.definition_nl, new.definition_en);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS words_fts_delete AFTER DELETE ON words BEGIN
+                INSERT INTO words_fts(words_fts, rowid, dutch, translation, definition_nl, definition_en)
+                VALUES ('delete', old.id, old.dutch, old.translation, old.definition_nl, old.definition_en);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS words_fts_update
+            AFTER UPDATE OF dutch, translation, definition_nl, definition_en ON words BEGIN
+                INSERT INTO words_fts(words_fts, rowid, dutch, translation, definition_nl, definition_en)
+                VALUES ('delete', old.id, old.dutch, old.translation, old.definition_nl, old.definition_en);
+                INSERT INTO words_fts(rowid, dutch, translation, definition_nl, definition_en)
+                VALUES (new.id, new.dutch, new.translation, new.definition_nl, new.definition_en);
+            END
+        """)
+
+        if not exists:
+            # Index the rows that were there before the table existed
+            cursor.execute("INSERT INTO words_fts(words_fts) VALUES ('rebuild')")
+        conn.commit()
+        return True
 
-            # Create indexes for faster lookups
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_dutch ON words(dutch)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_word_id ON anki_words(word_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_anki_note_id ON anki_words(anki_note_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_synced_at ON anki_words(synced_at)")
+    @staticmethod
+    def _table_columns(conn, table: str) -> set:
+        """Return the column names of a table."""
+        return {col[1] for col in conn.execute(f"PRAGMA table_info({table})")}
 
-            conn.commit()
+    def optimize_search_index(self) -> bool:
+        """
+        Merge the words_fts index into a single segment. Each write adds small segments that
+        searches have to visit, so this is worth running after bulk imports. Returns False
+        if there's no search index.
+        """
+        if not self._has_fts:
+            return False
+        with self._connect() as conn:
+            conn.execute("INSERT INTO words_fts(words_fts) VALUES ('optimize')")
+        return True
 
-            # Migrate legacy data if old columns exist
-            self._migrate_legacy_anki_data(conn)
-            self._migrate_add_anki_stats_columns(conn)
-            self._migrate_add_level_column(conn)
-            self._migrate_add_tags_column(conn)
-            self._migrate_add_score_column(conn)
-            self._migrate_drop_legacy_anki_columns(conn)
+    def fts_match(self, query: str) -> Optional[str]:
+        """
+        Return the words_fts MATCH expression for a substring search of query, or None when
+        the index can't answer it (no FTS5, or shorter than the three characters a trigram needs).
+        """
+        if not self._has_fts or len(query) < 3:
+            return None
+        # One quoted phrase, so FTS5 syntax in the query is matched literally
+        return '"' + query.replace('"', '""') + '"'
 
-    def _migrate_legacy_anki_data(self, conn):
+    def _migrate_legacy_anki_data(self, conn, columns: set):
         """Migrate data from legacy synced_to_anki and anki_note_id columns to anki_words table."""
         cursor = conn.cursor()
 
         # Check if legacy columns exist
-        cursor.execute("PRAGMA table_info(words)")
-        columns = [col[1] for col in cursor.fetchall()]
-
         if 'synced_to_anki' in columns and 'anki_note_id' in columns:
             # Migrate data from words table to anki_words table
             cursor.execute("""
@@ -125,19 +384,14 @@ class WordDatabase:
                 FROM words
                 WHERE synced_to_anki = 1 AND anki_note_id IS NOT NULL
             """)
-            conn.commit()
 
             # Note: We don't drop the old columns to maintain backward compatibility
             # They can be manually dropped later if needed
 
-    def _migrate_add_anki_stats_columns(self, conn):
+    def _migrate_add_anki_stats_columns(self, conn, existing_columns: set):
         """Add Anki statistics columns to anki_words table if they don't exist."""
         cursor = conn.cursor()
 
-        # Check which columns exist in anki_words table
-        cursor.execute("PRAGMA table_info(anki_words)")
-        existing_columns = {col[1] for col in cursor.fetchall()}
-
         # Add missing columns
         columns_to_add = {
             'reviews': 'INTEGER',
@@ -150,46 +404,51 @@ class WordDatabase:
         for column_name, column_type in columns_to_add.items():
             if column_name not in existing_columns:
                 cursor.execute(f"ALTER TABLE anki_words ADD COLUMN {column_name} {column_type}")
+                existing_columns.add(column_name)
 
-        conn.commit()
-
-    def _migrate_add_level_column(self, conn):
+    def _migrate_add_level_column(self, conn, existing_columns: set):
         """Add level column to words table if it doesn't exist."""
         cursor = conn.cursor()
 
-        # Check if level column exists
-        cursor.execute("PRAGMA table_info(words)")
-        existing_columns = {col[1] for col in cursor.fetchall()}
-
         if 'level' not in existing_columns:
             cursor.execute("ALTER TABLE words ADD COLUMN level TEXT DEFAULT ''")
-            conn.commit()
+            existing_columns.add('level')
 
-    def _migrate_add_tags_column(self, conn):
+    def _migrate_add_tags_column(self, conn, existing_columns: set):
         """Add tags column to words table if it doesn't exist."""
         cursor = conn.cursor()
 
-        # Check if tags column exists
-        cursor.execute("PRAGMA table_info(words)")
-        existing_columns = {col[1] for col in cursor.fetchall()}
-
         if 'tags' not in existing_columns:
             cursor.execute("ALTER TABLE words ADD COLUMN tags TEXT DEFAULT '[]'")
-            conn.commit()
+            existing_columns.add('tags')
 
-    def _migrate_add_score_column(self, conn):
+    def _migrate_add_score_column(self, conn, existing_columns: set):
         """Add score column to words table if it doesn't exist."""
         cursor = conn.cursor()
 
-        # Check if score column exists
-        cursor.execute("PRAGMA table_info(words)")
-        existing_columns = {col[1] for col in cursor.fetchall()}
-
         if 'score' not in existing_columns:
             cursor.execute("ALTER TABLE words ADD COLUMN score INTEGER DEFAULT 1")
-            conn.commit()
+            existing_columns.add('score')
+
+    def _migrate_add_is_synced_column(self, conn, existing_columns: set):
+        """Add the is_synced flag to words table if it doesn't exist, filled from anki_words."""
+        cursor = conn.cursor()
 
-    def _migrate_drop_legacy_anki_columns(self, conn):
+        if 'is_synced' not in existing_columns:
+            cursor.execute("ALTER TABLE words ADD COLUMN is_synced INTEGER NOT NULL DEFAULT 0")
+            existing_columns.add('is_synced')
+        # Also fills tables rebuilt by _migrate_drop_legacy_anki_columns, which start out at 0
+        cursor.execute("""
+            UPDATE words SET is_synced = EXISTS (
+                SELECT 1 FROM anki_words a WHERE a.word_id = words.id AND a.synced_at IS NOT NULL
+            )
+        """)
+
+        # Superseded by is_synced; the search trigger is recreated to skip is_synced-only updates
+        cursor.execute("DROP INDEX IF EXISTS idx_anki_synced_word")
+        cursor.execute("DROP TRIGGER IF EXISTS words_fts_update")
+
+    def _migrate_drop_legacy_anki_columns(self, conn, cols: set):
         """Drop legacy Anki-related columns from words table if present.
 
         Specifically removes words.synced_to_anki and words.anki_note_id and the idx_synced index.
@@ -198,8 +457,6 @@ class WordDatabase:
         cursor = conn.cursor()
 
         # Check if legacy columns exist
-        cursor.execute("PRAGMA table_info(words)")
-        cols = [row[1] for row in cursor.fetchall()]
         needs_drop = ('synced_to_anki' in cols) or ('anki_note_id' in cols)
         if not needs_drop:
             return
@@ -210,36 +467,28 @@ class WordDatabase:
         except sqlite3.OperationalError:
             pass
 
-        # Rebuild table without the legacy columns
+        # Rebuild table without the legacy columns. Foreign keys are off and the rename
+        # is done the legacy way so anki_words keeps referencing "words"; otherwise its
+        # foreign key follows the rename and dropping words_old cascades into it.
+        conn.commit()
+        conn.execute("PRAGMA foreign_keys=OFF")
+        conn.execute("PRAGMA legacy_alter_table=ON")
+        try:
+            self._rebuild_words_table(cursor)
+            conn.commit()
+            # The rebuilt table has the current schema's columns
+            cols.clear()
+            cols.update(self._table_columns(conn, "words"))
+        finally:
+            conn.execute("PRAGMA legacy_alter_table=OFF")
+            conn.execute("PRAGMA foreign_keys=ON")
+
+    def _rebuild_words_table(self, cursor):
         # 1) Rename existing table
         cursor.execute("ALTER TABLE words RENAME TO words_old")
 
         # 2) Create new table (without legacy columns)
-        cursor.execute(
-            """
-            CREATE TABLE words (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                dutch TEXT NOT NULL,
-                translation TEXT NOT NULL,
-                definition_nl TEXT NOT NULL,
-                definition_en TEXT NOT NULL,
-                pronunciation TEXT NOT NULL,
-                grammar TEXT NOT NULL,
-                collocations TEXT NOT NULL,
-                synonyms TEXT NOT NULL,
-                examples_nl TEXT NOT NULL,
-                examples_en TEXT NOT NULL,
-                etymology TEXT NOT NULL,
-                related TEXT NOT NULL,
-                level TEXT DEFAULT '',
-                tags TEXT DEFAULT '[]',
-                score INTEGER DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(dutch)
-            )
-            """
-        )
+        cursor.execute(_CREATE_WORDS_SQL)
 
         # 3) Copy data from old to new (only the columns we keep)
         cursor.execute(
@@ -266,15 +515,29 @@ class WordDatabase:
 
         # 5) Recreate indexes used by the app
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_dutch ON words(dutch)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_created_at ON words(created_at)")
 
-        conn.commit()
+    def _migrate_normalize_dutch(self, conn):
+        """Store legacy rows with normalized dutch so saves can upsert on UNIQUE(dutch)."""
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT id, dutch FROM words")
+        legacy = [(row[0], row[1]) for row in cursor.fetchall() if row[1] != self._normalize_dutch(row[1])]
+        if not legacy:
+            return
+
+        # OR IGNORE: where a normalized copy already exists, leave the old duplicate alone
+        cursor.executemany(
+            "UPDATE OR IGNORE words SET dutch = ? WHERE id = ?",
+            [(self._normalize_dutch(dutch), word_id) for word_id, dutch in legacy],
+        )
 
     def _normalize_dutch(self, dutch: str) -> str:
         """Normalize dutch text: trim whitespace and lowercase for consistent storage/lookup."""
         return dutch.strip().lower()
 
-    def _word_to_dict(self, word: Word) -> dict:
-        """Convert Word object to dictionary for database storage."""
+    def _word_to_row(self, word: Word) -> tuple:
+        """Convert Word object to a row tuple (in _WORD_COLUMNS order) for database storage."""
         # Sanitize fields to preserve only valid inline HTML and repair tags
         dutch = _sanitize_inline_html(word.dutch)
         translation = _sanitize_inline_html(word.translation)
@@ -291,26 +554,47 @@ class WordDatabase:
         related = _sanitize_list_html(word.related)
         tags = _sanitize_list_html(word.tags)
 
-        return {
-            'dutch': self._normalize_dutch(dutch),
-            'translation': translation,
-            'definition_nl': definition_nl,
-            'definition_en': definition_en,
-            'pronunciation': pronunciation,
-            'grammar': grammar,
-            'collocations': json.dumps(collocations),
-            'synonyms': json.dumps(synonyms),
-            'examples_nl': json.dumps(examples_nl),
-            'examples_en': json.dumps(examples_en),
-            'etymology': etymology,
-            'related': json.dumps(related),
-            'tags': json.dumps(tags),
-            'level': word.level,
-            'score': word.score
-        }
+        return (
+            self._normalize_dutch(dutch),
+            translation,
+            definition_nl,
+            definition_en,
+            pronunciation,
+            grammar,
+            # List columns are bound as orjson bytes; tags stays TEXT since the
+            # "missing tags" queries compare it against '[]'
+            orjson.dumps(collocations),
+            orjson.dumps(synonyms),
+            orjson.dumps(examples_nl),
+            orjson.dumps(examples_en),
+            etymology,
+            orjson.dumps(related),
+            orjson.dumps(tags).decode(),
+            word.level,
+            word.score,
+        )
 
-    def _dict_to_word(self, row: dict) -> Word:
-        """Convert database row to Word object."""
+    def _dict_to_word(self, row: sqlite3.Row) -> Word:
+        """Convert database row to Word object, reusing the decoded word if the row hasn't changed."""
+        key = (row['dutch'], row['updated_at'])
+        if key[1] is None:
+            return self._decode_word(row)
+
+        with self._word_cache_lock:
+            cached = self._word_cache.get(key)
+            if cached is not None:
+                self._word_cache.move_to_end(key)
+        if cached is None:
+            cached = self._decode_word(row)
+            with self._word_cache_lock:
+                self._word_cache[key] = cached
+                while len(self._word_cache) > WORD_CACHE_SIZE:
+                    self._word_cache.popitem(last=False)
+
+        # Callers append to the lists (e.g. level tags), so each gets its own copies
+        return cached.model_copy(update={field: list(getattr(cached, field)) for field in _LIST_FIELDS})
+
+    def _decode_word(self, row: sqlite3.Row) -> Word:
         return Word(
             dutch=row['dutch'],
             translation=row['translation'],
@@ -318,81 +602,98 @@ class WordDatabase:
             definition_en=row['definition_en'],
             pronunciation=row['pronunciation'],
             grammar=row['grammar'],
-            collocations=json.loads(row['collocations']),
-            synonyms=json.loads(row['synonyms']),
-            examples_nl=json.loads(row['examples_nl']),
-            examples_en=json.loads(row['examples_en']),
+            collocations=orjson.loads(row['collocations']),
+            synonyms=orjson.loads(row['synonyms']),
+            examples_nl=orjson.loads(row['examples_nl']),
+            examples_en=orjson.loads(row['examples_en']),
             etymology=row['etymology'],
-            related=json.loads(row['related']),
-            tags=json.loads(row.get('tags', '[]')),
-            level=row.get('level', ''),  # Use get() for backwards compatibility
-            score=row.get('score', 1)  # Default to 1 for existing entries
+            related=orjson.loads(row['related']),
+            # level, tags and score always exist once init_database has migrated the table
+            tags=orjson.loads(row['tags']),
+            level=row['level'],
+            score=row['score']
         )
 
     def save_word(self, word: Word) -> int:
         """Save a word to the database. Returns the row ID.
 
-        Uses normalized matching (trim + lowercase) to avoid duplicates differing only by case/spacing.
+        Dutch text is stored normalized (trim + lowercase), so words differing only by
+        case/spacing update the same row.
         """
-        word_dict = self._word_to_dict(word)
-        normalized = self._normalize_dutch(word.dutch)
-
         with self._connect() as conn:
-            cursor = conn.cursor()
+            return self._save_word(conn.cursor(), word)
 
-            # Check if a logically equivalent word already exists (case/space-insensitive)
-            cursor.execute(
-                (
-                    "SELECT id, dutch FROM words "
-                    "WHERE LOWER(TRIM(dutch)) = LOWER(TRIM(?)) "
-                    "ORDER BY CASE WHEN dutch = ? THEN 0 ELSE 1 END "
-                    "LIMIT 1"
-                ),
-                (normalized, word.dutch,)
-            )
-            existing = cursor.fetchone()
+    def _save_word(self, cursor: sqlite3.Cursor, word: Word) -> int:
+        """Insert or update a word using the caller's cursor (and transaction)."""
+        cursor.execute(
+            _UPSERT_WORD_SQL + " RETURNING id",
+            (*self._word_to_row(word), datetime.now().isoformat()),
+        )
+        return cursor.fetchone()[0]
 
-            if existing:
-                # Update the existing row by id to avoid multi-row updates
-                word_dict['updated_at'] = datetime.now().isoformat()
-                placeholders = ', '.join([f"{key} = ?" for key in word_dict.keys()])
-                values = list(word_dict.values()) + [existing['id']]
+    def save_words(self, words: List[Word]) -> List[int]:
+        """Save multiple words in a single transaction. Returns list of row IDs in input order."""
+        if not words:
+            return []
 
-                cursor.execute(f"""
-                    UPDATE words SET {placeholders} WHERE id = ?
-                """, values)
-                return existing['id']
-            else:
-                # Insert as new row (already normalized in word_dict)
-                placeholders = ', '.join(['?' for _ in word_dict])
-                columns = ', '.join(word_dict.keys())
+        with self._connect() as conn:
+            # Take the write lock up front so the upsert and the id lookup see one snapshot
+            conn.execute("BEGIN IMMEDIATE")
+            return self._save_words(conn.cursor(), words)
+
+    def _save_words(self, cursor: sqlite3.Cursor, words: List[Word]) -> List[int]:
+        """Bulk version of _save_word: one executemany upsert, then the row ids in one lookup."""
+        timestamp = datetime.now().isoformat()
+        rows = [self._word_to_row(word) for word in words]
+        cursor.executemany(_UPSERT_WORD_SQL, ((*row, timestamp) for row in rows))
+
+        # executemany doesn't return row ids, so look them up by the stored text
+        ids = {}
+        stored = list(dict.fromkeys(row[0] for row in rows))
+        for start in range(0, len(stored), SQL_VARIABLES_CHUNK):
+            chunk = stored[start:start + SQL_VARIABLES_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"SELECT id, dutch FROM words WHERE dutch IN ({placeholders})", chunk)
+            ids.update((row["dutch"], row["id"]) for row in cursor.fetchall())
+
+        return [ids[row[0]] for row in rows]
+
+    def apply_bulk(self, deletes: List[str], saves: List[Word]) -> tuple[List[int], List[int]]:
+        """Delete and save words in a single transaction.
+
+        Returns (row IDs of the saved words, Anki note IDs of the deleted words).
+        """
+        normalized = list(dict.fromkeys(self._normalize_dutch(dutch) for dutch in deletes))
+        with self._connect() as conn:
+            # The note id lookup is a plain SELECT, which wouldn't start the transaction
+            # by itself; begin it explicitly so nothing can change before the DELETE
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.cursor()
 
+            deleted_note_ids = []
+            if normalized:
+                placeholders = ",".join("?" * len(normalized))
+                # Collect note ids first, the anki_words rows go away with the CASCADE
                 cursor.execute(f"""
-                    INSERT INTO words ({columns}) VALUES ({placeholders})
-                """, list(word_dict.values()))
-                return cursor.lastrowid
+                    SELECT a.anki_note_id
+                    FROM anki_words a
+                    INNER JOIN words w ON a.word_id = w.id
+                    WHERE w.dutch IN ({placeholders}) AND a.anki_note_id IS NOT NULL
+                """, normalized)
+                deleted_note_ids = [row[0] for row in cursor.fetchall()]
+                cursor.execute(f"DELETE FROM words WHERE dutch IN ({placeholders})", normalized)
 
-    def save_words(self, words: List[Word]) -> List[int]:
-        """Save multiple words to the database. Returns list of row IDs."""
-        return [self.save_word(word) for word in words]
+            row_ids = self._save_words(cursor, saves) if saves else []
+            return row_ids, deleted_note_ids
 
     def update_word_by_id(self, word_id: int, word: Word) -> bool:
         """Update a word by its row ID. Returns True if updated."""
-        word_dict = self._word_to_dict(word)
         with self._connect() as conn:
             cursor = conn.cursor()
 
-            # Ensure updated_at is set
-            word_dict['updated_at'] = datetime.now().isoformat()
-
-            placeholders = ', '.join([f"{key} = ?" for key in word_dict.keys()])
-            values = list(word_dict.values()) + [word_id]
-
             cursor.execute(
-                f"""
-                UPDATE words SET {placeholders} WHERE id = ?
-                """,
-                values,
+                _UPDATE_WORD_SQL,
+                (*self._word_to_row(word), datetime.now().isoformat(), word_id),
             )
             conn.commit()
             return cursor.rowcount > 0
@@ -407,7 +708,7 @@ class WordDatabase:
             row = cursor.fetchone()
 
             if row:
-                return self._dict_to_word(dict(row))
+                return self._dict_to_word(row)
             return None
 
     def get_word_by_id(self, word_id: int) -> Optional[Word]:
@@ -419,7 +720,7 @@ class WordDatabase:
             row = cursor.fetchone()
 
             if row:
-                return self._dict_to_word(dict(row))
+                return self._dict_to_word(row)
             return None
 
     def get_word_id(self, dutch: str) -> Optional[int]:
@@ -433,86 +734,121 @@ class WordDatabase:
 
             return row["id"] if row else None
 
-    def get_all_words(self) -> List[Word]:
-        """Get all words from the database."""
+    def get_words(self, dutch_list: List[str]) -> Dict[str, Word]:
+        """Get several words by their Dutch text. Returns {normalized dutch: Word} for the ones found."""
+        return {row["dutch"]: self._dict_to_word(row) for row in self._select_by_dutch(dutch_list)}
+
+    def get_words_with_ids(self, dutch_list: List[str]) -> dict:
+        """Get several words by their Dutch text. Returns {normalized dutch: (id, Word)} for the ones found."""
+        return {
+            row["dutch"]: (row["id"], self._dict_to_word(row))
+            for row in self._select_by_dutch(dutch_list)
+        }
+
+    def _select_by_dutch(self, dutch_list: List[str]) -> List[sqlite3.Row]:
+        """Fetch the rows for the given Dutch words with one IN (...) query per chunk."""
+        normalized = list(dict.fromkeys(self._normalize_dutch(dutch) for dutch in dutch_list))
+        rows = []
         with self._connect() as conn:
             cursor = conn.cursor()
 
-            cursor.execute("SELECT * FROM words ORDER BY created_at DESC")
-            rows = cursor.fetchall()
+            for start in range(0, len(normalized), SQL_VARIABLES_CHUNK):
+                chunk = normalized[start:start + SQL_VARIABLES_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(f"SELECT * FROM words WHERE dutch IN ({placeholders})", chunk)
+                rows.extend(cursor.fetchall())
+        return rows
 
-            return [self._dict_to_word(dict(row)) for row in rows]
+    def get_all_words(self, limit: Optional[int] = None, offset: int = 0) -> List[Word]:
+        """Get all words from the database, newest first, optionally one page at a time."""
+        return list(self.iter_all_words(limit=limit, offset=offset))
+
+    def iter_all_words(self, chunk: int = 500, limit: Optional[int] = None, offset: int = 0) -> Iterator[Word]:
+        """
+        Yield all words, newest first, decoding `chunk` rows at a time. Consume it on the
+        calling thread; the cursor belongs to that thread's connection.
+        """
+        cursor = self._connect().cursor()
+        cursor.arraysize = chunk
+        try:
+            # LIMIT -1 means no limit; idx_created_at serves the order without a sort
+            cursor.execute(
+                "SELECT * FROM words ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset),
+            )
+            while rows := cursor.fetchmany():
+                for row in rows:
+                    yield self._dict_to_word(row)
+        finally:
+            cursor.close()
 
     def get_unsynced_words(self) -> List[Word]:
         """Get all words that haven't been synced to Anki yet."""
         with self._connect() as conn:
             cursor = conn.cursor()
 
-            # Get words that don't have an entry in anki_words or have NULL synced_at
+            # is_synced mirrors whether the word's anki_words record has a synced_at
             cursor.execute("""
-                SELECT w.* FROM words w
-                LEFT JOIN anki_words a ON w.id = a.word_id
-                WHERE a.synced_at IS NULL OR a.word_id IS NULL
-                ORDER BY w.created_at DESC
+                SELECT * FROM words
+                WHERE is_synced = 0
+                ORDER BY created_at DESC
             """)
             rows = cursor.fetchall()
 
-            return [self._dict_to_word(dict(row)) for row in rows]
+            return [self._dict_to_word(row) for row in rows]
 
-    def mark_synced(self, dutch: str, anki_note_id: Optional[int] = None, deck_name: str = "Default"):
-        """Mark a word as synced to Anki."""
-        dutch = self._normalize_dutch(dutch)
+    def get_words_without_level(self) -> List[Word]:
+        """Get all words that don't have a difficulty level yet."""
         with self._connect() as conn:
             cursor = conn.cursor()
-            timestamp = datetime.now().isoformat()
 
-            cursor.execute("SELECT id FROM words WHERE dutch = ?", (dutch,))
-            row = cursor.fetchone()
-            if not row:
-                return
+            cursor.execute("""
+                SELECT * FROM words
+                WHERE level IS NULL OR TRIM(level) = ''
+                ORDER BY created_at DESC
+            """)
+            rows = cursor.fetchall()
 
-            word_id = row[0]
+            return [self._dict_to_word(row) for row in rows]
+
+    def get_words_without_tags(self) -> List[Word]:
+        """Get all words that don't have any tags yet."""
+        with self._connect() as conn:
+            cursor = conn.cursor()
 
-            # Insert or update anki_words record
             cursor.execute("""
-                INSERT INTO anki_words (word_id, anki_note_id, deck_name, synced_at, last_updated_at, sync_count)
-                VALUES (?, ?, ?, ?, ?, 1)
-                ON CONFLICT(word_id) DO UPDATE SET
-                    anki_note_id = ?,
-                    deck_name = ?,
-                    last_updated_at = ?,
-                    sync_count = sync_count + 1
-            """, (word_id, anki_note_id, deck_name, timestamp, timestamp,
-                  anki_note_id, deck_name, timestamp))
+                SELECT * FROM words
+                WHERE tags IS NULL OR tags = '' OR tags = '[]'
+                ORDER BY created_at DESC
+            """)
+            rows = cursor.fetchall()
+
+            return [self._dict_to_word(row) for row in rows]
 
+    def mark_synced(self, dutch: str, anki_note_id: Optional[int] = None, deck_name: str = "Default"):
+        """Mark a word as synced to Anki."""
+        dutch = self._normalize_dutch(dutch)
+        with self._connect() as conn:
+            # Insert or update anki_words record
+            conn.execute(_MARK_SYNCED_SQL, (anki_note_id, deck_name, dutch))
             conn.commit()
 
     def mark_synced_by_id(self, word_id: int, anki_note_id: Optional[int] = None, deck_name: str = "Default"):
         """Mark a word as synced to Anki using its ID."""
         with self._connect() as conn:
             cursor = conn.cursor()
-            timestamp = datetime.now().isoformat()
 
             cursor.execute(
-                """
+                f"""
                 INSERT INTO anki_words (word_id, anki_note_id, deck_name, synced_at, last_updated_at, sync_count)
-                VALUES (?, ?, ?, ?, ?, 1)
+                VALUES (?, ?, ?, {_NOW_SQL}, {_NOW_SQL}, 1)
                 ON CONFLICT(word_id) DO UPDATE SET
-                    anki_note_id = ?,
-                    deck_name = ?,
-                    last_updated_at = ?,
+                    anki_note_id = excluded.anki_note_id,
+                    deck_name = excluded.deck_name,
+                    last_updated_at = excluded.last_updated_at,
                     sync_count = sync_count + 1
                 """,
-                (
-                    word_id,
-                    anki_note_id,
-                    deck_name,
-                    timestamp,
-                    timestamp,
-                    anki_note_id,
-                    deck_name,
-                    timestamp,
-                ),
+                (word_id, anki_note_id, deck_name),
             )
             conn.commit()
 
@@ -522,29 +858,12 @@ class WordDatabase:
             anki_note_ids = [None] * len(words)
 
         with self._connect() as conn:
-            cursor = conn.cursor()
-            timestamp = datetime.now().isoformat()
-
-            for dutch, note_id in zip(words, anki_note_ids):
-                cursor.execute("SELECT id FROM words WHERE dutch = ?", (dutch,))
-                row = cursor.fetchone()
-                if not row:
-                    continue
-
-                word_id = row[0]
-
-                # Insert or update anki_words record
-                cursor.execute("""
-                    INSERT INTO anki_words (word_id, anki_note_id, deck_name, synced_at, last_updated_at, sync_count)
-                    VALUES (?, ?, ?, ?, ?, 1)
-                    ON CONFLICT(word_id) DO UPDATE SET
-                        anki_note_id = ?,
-                        deck_name = ?,
-                        last_updated_at = ?,
-                        sync_count = sync_count + 1
-                """, (word_id, note_id, deck_name, timestamp, timestamp,
-                      note_id, deck_name, timestamp))
-
+            # Insert or update every anki_words record in one statement; the word id is
+            # resolved inside it, and words that don't exist are skipped
+            conn.executemany(_MARK_SYNCED_SQL, [
+                (note_id, deck_name, self._normalize_dutch(dutch))
+                for dutch, note_id in zip(words, anki_note_ids)
+            ])
             conn.commit()
 
     def delete_word(self, dutch: str) -> bool:
@@ -564,11 +883,38 @@ class WordDatabase:
             conn.commit()
             return cursor.rowcount > 0
 
-    def search_words(self, query: str) -> List[Word]:
-        """Search words by Dutch text, translation, or definition."""
+    def search_words(self, query: str, limit: Optional[int] = None, offset: int = 0, prefix: bool = False) -> List[Word]:
+        """
+        Search words by Dutch text, translation, or definition, optionally one page at a time.
+        With prefix=True only Dutch words starting with query match (autocomplete), in
+        alphabetical order, read as a range of the idx_dutch index.
+        """
+        page = (-1 if limit is None else limit, offset)
         with self._connect() as conn:
             cursor = conn.cursor()
 
+            if prefix:
+                start = self._normalize_dutch(query)
+                cursor.execute("""
+                    SELECT * FROM words
+                    WHERE dutch >= ? AND dutch < ?
+                    ORDER BY dutch
+                    LIMIT ? OFFSET ?
+                """, (start, start + _MAX_CHAR, *page))
+                return [self._dict_to_word(row) for row in cursor.fetchall()]
+
+            match = self.fts_match(query)
+            if match is not None:
+                # Same order as the LIKE search below, which walks idx_created_at backwards
+                cursor.execute("""
+                    SELECT w.* FROM words_fts f
+                    JOIN words w ON w.id = f.rowid
+                    WHERE words_fts MATCH ?
+                    ORDER BY w.created_at DESC, w.id DESC
+                    LIMIT ? OFFSET ?
+                """, (match, *page))
+                return [self._dict_to_word(row) for row in cursor.fetchall()]
+
             search_pattern = f"%{query}%"
             cursor.execute("""
                 SELECT * FROM words
@@ -577,42 +923,47 @@ class WordDatabase:
                    OR definition_nl LIKE ?
                    OR definition_en LIKE ?
                 ORDER BY created_at DESC
-            """, (search_pattern, search_pattern, search_pattern, search_pattern))
+                LIMIT ? OFFSET ?
+            """, (search_pattern, search_pattern, search_pattern, search_pattern, *page))
 
             rows = cursor.fetchall()
-            return [self._dict_to_word(dict(row)) for row in rows]
+            return [self._dict_to_word(row) for row in rows]
 
-    def get_stats(self) -> dict:
-        """Get database statistics."""
-        with self._connect() as conn:
-            cursor = conn.cursor()
+    def _cached_query(self, name: str, query):
+        """
+        Return query(conn), reusing this thread's last result until the database changes.
 
-            cursor.execute("SELECT COUNT(*) as total FROM words")
-            total = cursor.fetchone()[0]
+        PRAGMA data_version moves when another connection (the bot, viewer and CLI
+        share the file) commits, and total_changes when this one writes.
+        """
+        conn = self._connect()
+        version = (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+        cached = self._local.results.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
 
-            # Count words that have a sync record with synced_at
-            cursor.execute("""
-                SELECT COUNT(*) as synced
-                FROM words w
-                INNER JOIN anki_words a ON w.id = a.word_id
-                WHERE a.synced_at IS NOT NULL
-            """)
-            synced = cursor.fetchone()[0]
+        result = query(conn)
+        self._local.results[name] = (version, result)
+        return result
 
-            # Count words that don't have a sync record or have NULL synced_at
-            cursor.execute("""
-                SELECT COUNT(*) as unsynced
-                FROM words w
-                LEFT JOIN anki_words a ON w.id = a.word_id
-                WHERE a.synced_at IS NULL OR a.word_id IS NULL
-            """)
-            unsynced = cursor.fetchone()[0]
+    def get_stats(self) -> dict:
+        """Get database statistics."""
+        return dict(self._cached_query("stats", self._query_stats))
 
-            return {
-                'total_words': total,
-                'synced_to_anki': synced,
-                'unsynced': unsynced
-            }
+    def _query_stats(self, conn: sqlite3.Connection) -> dict:
+        cursor = conn.cursor()
+
+        # Two index-only counts instead of reading is_synced from every row: the total from the
+        # smallest index on words, the unsynced ones from the partial idx_words_unsynced
+        cursor.execute("""
+            SELECT total_words, total_words - unsynced AS synced_to_anki, unsynced
+            FROM (
+                SELECT
+                    (SELECT COUNT(*) FROM words) AS total_words,
+                    (SELECT COUNT(*) FROM words WHERE is_synced = 0) AS unsynced
+            )
+        """)
+        return dict(cursor.fetchone())
 
     def get_sync_info(self, dutch: str) -> Optional[dict]:
         """Get Anki sync information for a word."""
@@ -646,16 +997,32 @@ class WordDatabase:
 
     def get_all_sync_info(self) -> List[dict]:
         """Get Anki sync information for all synced words."""
-        with self._connect() as conn:
-            cursor = conn.cursor()
+        return [dict(info) for info in self._cached_query("sync_info", self._query_all_sync_info)]
 
-            cursor.execute("""
-                SELECT w.dutch, a.*
-                FROM anki_words a
-                INNER JOIN words w ON a.word_id = w.id
-                WHERE a.synced_at IS NOT NULL
-                ORDER BY a.synced_at DESC
-            """)
+    def _query_all_sync_info(self, conn: sqlite3.Connection) -> List[dict]:
+        cursor = conn.cursor()
 
-            rows = cursor.fetchall()
-            return [dict(row) for row in rows]
+        cursor.execute("""
+            SELECT w.dutch, a.*
+            FROM anki_words a
+            INNER JOIN words w ON a.word_id = w.id
+            WHERE a.synced_at IS NOT NULL
+            ORDER BY a.synced_at DESC
+        """)
+
+        rows = cursor.fetchall()
+        return [dict(row) for row in rows]
+
+
+_db: Optional[WordDatabase] = None
+_db_lock = threading.Lock()
+
+
+def get_db() -> WordDatabase:
+    """Return the process-wide WordDatabase, creating it on first use."""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                _db = WordDatabase()
+    return _db
@@ -1,20 +1,29 @@
-import json
 import os
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
+import orjson
+
 SETTINGS_FILE = "user_settings.json"
 
-ALLOWED_MODELS = [
+USER_CONFIG_CACHE_SIZE = 1024
+
+# Ordered for the bot's menus; validation goes through the frozensets below
+ALLOWED_MODELS = (
     "gpt-5.5",
     "gpt-5.4",
     "gpt-5.4-mini",
     "gpt-5.4-nano"
-]
+)
 
-ALLOWED_EFFORTS = ["none", "low", "medium", "high", "xhigh"]
+ALLOWED_EFFORTS = ("none", "low", "medium", "high", "xhigh")
 
-ALLOWED_VERBOSITIES = ["low", "medium", "high"]
+ALLOWED_VERBOSITIES = ("low", "medium", "high")
+
+_VALID_MODELS = frozenset(ALLOWED_MODELS)
+_VALID_EFFORTS = frozenset(ALLOWED_EFFORTS)
+_VALID_VERBOSITIES = frozenset(ALLOWED_VERBOSITIES)
 
 @dataclass
 class UserConfig:
@@ -28,11 +37,11 @@ class UserConfig:
         effort = data.get("effort", "medium")
         verbosity = data.get("verbosity", "medium")
 
-        if model not in ALLOWED_MODELS:
+        if model not in _VALID_MODELS:
             model = "gpt-5.5"
-        if effort not in ALLOWED_EFFORTS:
+        if effort not in _VALID_EFFORTS:
             effort = "medium"
-        if verbosity not in ALLOWED_VERBOSITIES:
+        if verbosity not in _VALID_VERBOSITIES:
             verbosity = "medium"
 
         return cls(model=model, effort=effort, verbosity=verbosity)
@@ -44,34 +53,70 @@ class UserConfig:
             "verbosity": self.verbosity
         }
 
-_user_config_cache: Dict[int, UserConfig] = {}
+# LRU of parsed configs; entries are replaced whenever a user's settings change
+_user_config_cache: "OrderedDict[int, UserConfig]" = OrderedDict()
+
+def _cache_user_config(user_id: int, config: UserConfig) -> None:
+    _user_config_cache[user_id] = config
+    _user_config_cache.move_to_end(user_id)
+    while len(_user_config_cache) > USER_CONFIG_CACHE_SIZE:
+        _user_config_cache.popitem(last=False)
+
+# Parsed settings file keyed by its (mtime, size), so unchanged files aren't re-read
+_settings_cache: Optional[Tuple[Tuple[int, int], Dict[str, Dict[str, Any]]]] = None
+
+def _file_signature() -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(SETTINGS_FILE)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def _copy_settings(settings: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    # Callers modify the result before saving it; keep the cached copy untouched
+    return {user_id: dict(user_settings) for user_id, user_settings in settings.items()}
 
 def load_user_settings() -> Dict[str, Dict[str, Any]]:
-    if not os.path.exists(SETTINGS_FILE):
+    global _settings_cache
+
+    signature = _file_signature()
+    if signature is None:
         return {}
+    if _settings_cache is not None and _settings_cache[0] == signature:
+        return _copy_settings(_settings_cache[1])
 
     try:
-        with open(SETTINGS_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
+        with open(SETTINGS_FILE, 'rb') as f:
+            settings = orjson.loads(f.read())
+    except (orjson.JSONDecodeError, IOError):
         return {}
 
+    _settings_cache = (signature, settings)
+    return _copy_settings(settings)
+
 def save_user_settings(settings: Dict[str, Dict[str, Any]]) -> None:
-    with open(SETTINGS_FILE, 'w') as f:
-        json.dump(settings, f, indent=2)
+    global _settings_cache
+
+    with open(SETTINGS_FILE, 'wb') as f:
+        f.write(orjson.dumps(settings, option=orjson.OPT_INDENT_2))
+
+    signature = _file_signature()
+    _settings_cache = (signature, _copy_settings(settings)) if signature else None
 
 def get_user_config(user_id: int) -> UserConfig:
-    if user_id in _user_config_cache:
-        return _user_config_cache[user_id]
+    config = _user_config_cache.get(user_id)
+    if config is not None:
+        _user_config_cache.move_to_end(user_id)
+        return config
 
     settings = load_user_settings()
     user_settings = settings.get(str(user_id), {})
     config = UserConfig.from_dict(user_settings)
-    _user_config_cache[user_id] = config
+    _cache_user_config(user_id, config)
     return config
 
 def set_user_config(user_id: int, config: UserConfig) -> None:
-    _user_config_cache[user_id] = config
+    _cache_user_config(user_id, config)
     settings = load_user_settings()
     settings[str(user_id)] = config.to_dict()
     save_user_settings(settings)
@@ -82,11 +127,11 @@ def get_user_setting(user_id: int, key: str, default: Any = None) -> Any:
     return user_settings.get(key, default)
 
 def set_user_setting(user_id: int, key: str, value: Any) -> bool:
-    if key == "model" and value not in ALLOWED_MODELS:
+    if key == "model" and value not in _VALID_MODELS:
         return False
-    if key == "effort" and value not in ALLOWED_EFFORTS:
+    if key == "effort" and value not in _VALID_EFFORTS:
         return False
-    if key == "verbosity" and value not in ALLOWED_VERBOSITIES:
+    if key == "verbosity" and value not in _VALID_VERBOSITIES:
         return False
 
     settings = load_user_settings()
@@ -98,8 +143,8 @@ def set_user_setting(user_id: int, key: str, value: Any) -> bool:
     settings[user_id_str][key] = value
     save_user_settings(settings)
 
-    if user_id in _user_config_cache:
-        del _user_config_cache[user_id]
+    # Rebuild the config from what was just saved so the next lookup doesn't go to disk
+    _cache_user_config(user_id, UserConfig.from_dict(settings[user_id_str]))
 
     return True
 
@@ -29,6 +29,13 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 word_service = WordService()
 
+
+@app.teardown_appcontext
+def release_db_connection(exc):
+    # The dev server runs each request on a new thread; pass the connection (and its
+    # warm page cache) on to the next request instead of opening one per thread
+    word_service.db.release()
+
 # Web interface user ID
 WEB_USER_ID = 0
 
@@ -60,6 +67,8 @@ def start_background_job(target, *args):
             with jobs_lock:
                 jobs[job_id]['status'] = 'error'
                 jobs[job_id]['error'] = str(e)
+        finally:
+            word_service.db.release()
 
     thread = threading.Thread(target=run_job, daemon=True)
     thread.start()
@@ -83,21 +92,69 @@ def build_pagination_url(page, query, sort_by, order):
 # Make the function available in templates
 app.jinja_env.globals.update(get_pagination_url=build_pagination_url)
 
-def get_words_with_timestamps(query=None):
-    """Get words with their created_at, updated_at timestamps, Anki sync info, and search priority."""
-    import sqlite3
-    from pathlib import Path
+# ORDER BY terms for each sort option; {order} is ASC or DESC. Only these strings are
+# interpolated into the query, never the request value itself.
+SORT_COLUMNS = {
+    'dutch': "w.dutch {order}",
+    'translation': "w.translation COLLATE NOCASE {order}",
+    'created_at': "w.created_at {order}",
+    # Words without a level come after the leveled ones when ascending
+    'level': "COALESCE(w.level, '') = '' {order}, w.level {order}",
+}
+
+def _order_by_clause(sort_by, order, query):
+    """Build the ORDER BY clause; search results are grouped by priority first."""
+    terms = ["search_priority"] if query else []
+    if sort_by in SORT_COLUMNS:
+        terms.append(SORT_COLUMNS[sort_by].format(order="DESC" if order == 'desc' else "ASC"))
+    return f"ORDER BY {', '.join(terms)}" if terms else ""
 
-    db_path = Path("words.db")
+def _where_clause(query, tags):
+    """Build the WHERE clause and its parameters for a search query and tag filter."""
+    conditions, params = [], []
+
+    if query:
+        match = word_service.db.fts_match(query)
+        if match is not None:
+            # Find the matching rows in the full-text index instead of scanning every word
+            conditions.append("w.id IN (SELECT rowid FROM words_fts WHERE words_fts MATCH ?)")
+            params.append(match)
+        else:
+            conditions.append("""(w.dutch LIKE ? OR w.translation LIKE ?
+                OR w.definition_nl LIKE ? OR w.definition_en LIKE ?)""")
+            params.extend([f"%{query}%"] * 4)
+
+    if tags:
+        # OR semantics: any selected tag matches
+        placeholders = ",".join("?" * len(tags))
+        conditions.append(f"""EXISTS (
+            SELECT 1 FROM json_each(CASE WHEN json_valid(w.tags) THEN w.tags END)
+            WHERE lower(value) IN ({placeholders})
+        )""")
+        params.extend(t.lower() for t in tags)
+
+    return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), params
+
+def count_words(query=None, tags=None):
+    """Count the words a get_words_with_timestamps call with the same filters would return."""
+    where, params = _where_clause(query, tags)
+    with word_service.db._connect() as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM words w {where}", params).fetchone()[0]
+
+def get_words_with_timestamps(query=None, sort_by=None, order='desc', tags=None, limit=None, offset=0):
+    """Get words with their created_at, updated_at timestamps, Anki sync info, and search priority."""
     words_data = []
+    where, params = _where_clause(query, tags)
+    order_by = _order_by_clause(sort_by, order, query)
+    page = (-1 if limit is None else limit, offset)
 
-    with sqlite3.connect(db_path) as conn:
-        conn.row_factory = sqlite3.Row
+    # Reuse the database's long-lived per-thread connection (WAL, tuned PRAGMAs, Row factory)
+    with word_service.db._connect() as conn:
         cursor = conn.cursor()
 
         if query:
             search_pattern = f"%{query}%"
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT w.*, a.anki_note_id, a.deck_name, a.synced_at, a.sync_count,
                        a.reviews, a.lapses, a.ease_factor, a.interval, a.due,
                        CASE
@@ -107,20 +164,24 @@ def get_words_with_timestamps(query=None):
                        END as search_priority
                 FROM words w
                 LEFT JOIN anki_words a ON w.id = a.word_id
-                WHERE w.dutch LIKE ? OR w.translation LIKE ?
-                   OR w.definition_nl LIKE ? OR w.definition_en LIKE ?
-            """, (search_pattern, search_pattern, search_pattern, search_pattern, search_pattern, search_pattern))
+                {where}
+                {order_by}
+                LIMIT ? OFFSET ?
+            """, (search_pattern, search_pattern, *params, *page))
         else:
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT w.*, a.anki_note_id, a.deck_name, a.synced_at, a.sync_count,
                        a.reviews, a.lapses, a.ease_factor, a.interval, a.due
                 FROM words w
                 LEFT JOIN anki_words a ON w.id = a.word_id
-            """)
-
-        rows = cursor.fetchall()
-        for row in rows:
-            word = word_service.db._dict_to_word(dict(row))
+                {where}
+                {order_by}
+                LIMIT ? OFFSET ?
+            """, (*params, *page))
+
+        # Build the entries straight off the cursor rather than fetching every row first
+        for row in cursor:
+            word = word_service.db._dict_to_word(row)
             created_at = row['created_at']
             updated_at = row['updated_at']
             search_priority = row['search_priority'] if query else 0
@@ -153,56 +214,21 @@ def index():
     page = int(request.args.get('page', 1))  # Current page
     per_page = 100  # Words per page
 
-    all_words = get_words_with_timestamps(query if query else None)
-
     # Tag filtering (OR semantics: any selected tag matches)
     raw_tags = request.args.get('tags', '').strip()
     selected_tags = [t for t in raw_tags.split(',') if t]
-    if selected_tags:
-        selected_lower = {t.lower() for t in selected_tags}
-        def has_any_tag(word_obj):
-            word_tags = {str(t).lower() for t in (word_obj.tags or [])}
-            return not selected_lower.isdisjoint(word_tags)
-        all_words = [w for w in all_words if has_any_tag(w[0])]
-
-    # Sort words
-    # When searching, use search_priority as primary sort, user's choice as secondary
-    # When not searching, only use user's choice
-    reverse = (order == 'desc')
-    if query:
-        # Multi-level sort: first by search_priority (always ascending), then by user's choice
-        # To keep priority ascending while allowing user sort to be descending, we sort in two passes
-        if sort_by == 'dutch':
-            all_words.sort(key=lambda w: w[0].dutch.lower(), reverse=reverse)
-            all_words.sort(key=lambda w: w[4])  # Priority always ascending
-        elif sort_by == 'translation':
-            all_words.sort(key=lambda w: w[0].translation.lower(), reverse=reverse)
-            all_words.sort(key=lambda w: w[4])  # Priority always ascending
-        elif sort_by == 'created_at':
-            all_words.sort(key=lambda w: w[1] or '', reverse=reverse)
-            all_words.sort(key=lambda w: w[4])  # Priority always ascending
-        elif sort_by == 'level':
-            all_words.sort(key=lambda w: (w[0].level == '', w[0].level), reverse=reverse)
-            all_words.sort(key=lambda w: w[4])  # Priority always ascending
-    else:
-        # Normal sorting without search priority
-        if sort_by == 'dutch':
-            all_words.sort(key=lambda w: w[0].dutch.lower(), reverse=reverse)
-        elif sort_by == 'translation':
-            all_words.sort(key=lambda w: w[0].translation.lower(), reverse=reverse)
-        elif sort_by == 'created_at':
-            all_words.sort(key=lambda w: w[1] or '', reverse=reverse)
-        elif sort_by == 'level':
-            all_words.sort(key=lambda w: (w[0].level == '', w[0].level), reverse=reverse)
 
     # Pagination
-    total_words = len(all_words)
+    total_words = count_words(query if query else None, selected_tags)
     total_pages = (total_words + per_page - 1) // per_page  # Ceiling division
-    page = min(page, max(1, total_pages))  # Ensure page is within valid range
+    page = max(1, min(page, total_pages))  # Ensure page is within valid range
 
+    # Filtered, sorted and paged in SQL; when searching, by search priority first and the
+    # user's choice second
     start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    words_data = all_words[start_idx:end_idx]
+    words_data = get_words_with_timestamps(
+        query if query else None, sort_by, order, selected_tags, limit=per_page, offset=start_idx
+    )
 
     # Calculate page range to show (maximum 3 pages)
     page_range = []
@@ -566,7 +592,7 @@ def run_regenerate_job(word_id):
         return {'success': False, 'error': 'Word not found'}
 
     # Regenerate using ChatGPT with the configured model and effort.
-    result = get_definitions(current_word.dutch, user_id=WEB_USER_ID)
+    result = get_definitions(current_word.dutch, user_id=WEB_USER_ID, use_cache=False)
 
     if not result.words or len(result.words) == 0:
         return {'success': False, 'error': 'Failed to regenerate word'}
@@ -602,7 +628,21 @@ def main():
 
     print("Starting Anki GPT Word Viewer...")
     print("Open http://127.0.0.1:5000 in your browser")
-    app.run(debug=os.environ.get("DEBUG") == "1", host='0.0.0.0', port=5000)
+
+    if os.environ.get("DEBUG") == "1":
+        # Reloader and interactive debugger, for development only
+        app.run(debug=True, host='0.0.0.0', port=5000)
+        return
+
+    try:
+        from waitress import serve
+    except ImportError:
+        # Werkzeug's server, one thread per request
+        app.run(host='0.0.0.0', port=5000, threaded=True)
+        return
+
+    # A fixed set of worker threads, so release_db_connection keeps reusing a few connections
+    serve(app, host='0.0.0.0', port=5000, threads=int(os.environ.get("VIEWER_THREADS", "4")))
 
 if __name__ == '__main__':
     main()
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic import BaseModel, Field
 
 # Centralized list of allowed tags used across the app (UI, prompts, validation)
@@ -86,55 +87,125 @@ def _section(title: str, body: str) -> str:
     return f"<b><u>{title}</u></b>\n{body}"
 
 
-def word_to_anki(word: Word) -> dict:
-    """Convert a Word object to Anki fields dictionary."""
+@lru_cache(maxsize=1024)
+def _word_to_anki_cached(
+    dutch: str,
+    translation: str,
+    definition_nl: str,
+    definition_en: str,
+    pronunciation: str,
+    grammar: str,
+    collocations: tuple[str, ...],
+    synonyms: tuple[str, ...],
+    examples_nl: tuple[str, ...],
+    examples_en: tuple[str, ...],
+    etymology: str,
+    related: tuple[str, ...],
+) -> dict:
     return {
-        "Word": word.dutch,
-        "Translation": word.translation,
-        "Definition": word.definition_nl,
-        "Definition (eng)": word.definition_en,
-        "Pronunciation": word.pronunciation,
-        "Grammar": word.grammar,
-        "Collocations": "\n".join(word.collocations),
-        "Synonyms": "\n".join(word.synonyms),
-        "Examples": "\n".join(word.examples_nl),
-        "Examples (eng)": "\n".join(word.examples_en),
-        "Etymology": word.etymology,
-        "Related": "\n".join(word.related)
+        "Word": dutch,
+        "Translation": translation,
+        "Definition": definition_nl,
+        "Definition (eng)": definition_en,
+        "Pronunciation": pronunciation,
+        "Grammar": grammar,
+        "Collocations": "\n".join(collocations),
+        "Synonyms": "\n".join(synonyms),
+        "Examples": "\n".join(examples_nl),
+        "Examples (eng)": "\n".join(examples_en),
+        "Etymology": etymology,
+        "Related": "\n".join(related)
     }
 
+def word_to_anki(word: Word) -> dict:
+    """Convert a Word object to Anki fields dictionary."""
+    # Cached on the field values, so the same word is only serialized once
+    # across the add -> duplicate -> update path
+    fields = _word_to_anki_cached(
+        word.dutch,
+        word.translation,
+        word.definition_nl,
+        word.definition_en,
+        word.pronunciation,
+        word.grammar,
+        tuple(word.collocations),
+        tuple(word.synonyms),
+        tuple(word.examples_nl),
+        tuple(word.examples_en),
+        word.etymology,
+        tuple(word.related),
+    )
+    return dict(fields)
+
 def word_to_html(word: Word, include_extra: bool = False) -> str:
-    examples = list(zip(word.examples_nl, word.examples_en))
+    # Rendering is a pure function of the fields, so repeat words are served from the cache
+    return _word_to_html_cached(
+        word.dutch,
+        word.translation,
+        word.definition_nl,
+        word.definition_en,
+        word.pronunciation,
+        word.grammar,
+        tuple(word.collocations),
+        tuple(word.synonyms),
+        tuple(word.examples_nl),
+        tuple(word.examples_en),
+        word.etymology,
+        tuple(word.related),
+        tuple(word.tags),
+        word.score,
+        include_extra,
+    )
+
+@lru_cache(maxsize=1024)
+def _word_to_html_cached(
+    dutch: str,
+    translation: str,
+    definition_nl: str,
+    definition_en: str,
+    pronunciation: str,
+    grammar: str,
+    collocations: tuple[str, ...],
+    synonyms: tuple[str, ...],
+    examples_nl: tuple[str, ...],
+    examples_en: tuple[str, ...],
+    etymology: str,
+    related: tuple[str, ...],
+    tags: tuple[str, ...],
+    score: int,
+    include_extra: bool,
+) -> str:
+    examples = list(zip(examples_nl, examples_en))
     examples_html = "\n".join(
         f"• {nl}\n  <i>{en}</i>" for nl, en in examples
     )
 
     sections = [
-        f"<b><u>{word.dutch}</u></b>",
-        _section("Translation", word.translation),
-        _section("Grammar", word.grammar),
-        _section("Etymology", word.etymology),
-        _section("Pronunciation", word.pronunciation),
+        f"<b><u>{dutch}</u></b>",
+        _section("Translation", translation),
+        _section("Grammar", grammar),
+        _section("Etymology", etymology),
+        _section("Pronunciation", pronunciation),
     ]
 
-    if word.synonyms:
-        sections.append(_section("Synonyms", ', '.join(word.synonyms)))
+    if synonyms:
+        sections.append(_section("Synonyms", ', '.join(synonyms)))
 
-    if word.related:
-        sections.append(_section("Related", ', '.join(word.related)))
+    if related:
+        sections.append(_section("Related", ', '.join(related)))
 
     if include_extra:
-        sections.append(_section("Definitions", f"NL: {word.definition_nl}\nEN: {word.definition_en}"))
+        sections.append(_section("Definitions", f"NL: {definition_nl}\nEN: {definition_en}"))
 
-        if word.collocations:
-            sections.append(_section("Collocations", ', '.join(word.collocations)))
+        if collocations:
+            sections.append(_section("Collocations", ', '.join(collocations)))
 
         if examples_html:
             sections.append(_section("Examples", examples_html))
 
-        if word.tags:
-            sections.append(_section("Tags", ', '.join(word.tags)))
+        if tags:
+            sections.append(_section("Tags", ', '.join(tags)))
 
-        sections.append(_section("Score", str(word.score)))
+        sections.append(_section("Score", str(score)))
 
     return "\n\n".join(sections)
@@ -14,10 +14,10 @@ Usage:
     service.delete("hond")
 """
 import logging
-from typing import Optional, List
+from typing import Iterator, Optional, List
 from word import Word
-from db import WordDatabase
-from anki import delete_note, add_note, sync_anki, update_note_by_id
+from db import WordDatabase, get_db
+from anki import delete_note, delete_notes, add_note, add_and_sync, sync_anki, update_note_by_id
 from config import ENABLE_ANKI_SYNC
 
 logger = logging.getLogger(__name__)
@@ -36,10 +36,10 @@ class WordService:
         Initialize the word service.
 
         Args:
-            db: Optional WordDatabase instance (creates new one if not provided)
+            db: Optional WordDatabase instance (uses the shared one if not provided)
             deck_name: Anki deck name for synchronization
         """
-        self.db = db or WordDatabase()
+        self.db = db or get_db()
         self.deck_name = deck_name
         logger.debug(f"WordService initialized with deck: {deck_name}")
 
@@ -69,6 +69,26 @@ class WordService:
             logger.error(f"Error syncing word to Anki: {word.dutch} - {e}")
             return None
 
+    def _sync_words_to_anki(self, words: List[Word], sync: bool = True) -> List[tuple[Word, Optional[int]]]:
+        """
+        Add several words to Anki and sync with AnkiWeb in a single AnkiConnect request.
+
+        Args:
+            words: The Word objects to sync
+            sync: Whether to include the AnkiWeb sync in the request
+
+        Returns:
+            List of (word, anki_note_id) tuples, with None for words that failed
+        """
+        if not ENABLE_ANKI_SYNC or not words:
+            return [(word, None) for word in words]
+
+        try:
+            return add_and_sync(words, self.deck_name, sync=sync)
+        except Exception as e:
+            logger.error(f"Error syncing {len(words)} words to Anki: {e}")
+            return [(word, None) for word in words]
+
     def _save_and_sync_word(self, word: Word) -> tuple[int, Optional[int]]:
         """
         Save a word to the database and sync it to Anki.
@@ -79,17 +99,8 @@ class WordService:
         Returns:
             Tuple of (db_row_id, anki_note_id)
         """
-        # Add level as a tag if it exists and is not already in tags
-        if word.level and word.level not in word.tags:
-            word.tags.append(word.level)
-
         # Step 1: Save to database
-        try:
-            db_row_id = self.db.save_word(word)
-            logger.info(f"Saved word to database: {word.dutch} (row_id: {db_row_id})")
-        except Exception as e:
-            logger.error(f"Failed to save word to database: {word.dutch} - {e}")
-            raise
+        db_row_id = self.save(word)
 
         # Step 2: Sync to Anki
         anki_note_id = self._sync_word_to_anki(word)
@@ -106,6 +117,31 @@ class WordService:
 
     # ==================== CRUD Operations ====================
 
+    def save(self, word: Word) -> int:
+        """
+        Save a word to the database without syncing it to Anki.
+
+        Args:
+            word: The Word object to save
+
+        Returns:
+            The database row ID
+
+        Raises:
+            Exception: If database save fails
+        """
+        # Add level as a tag if it exists and is not already in tags
+        if word.level and word.level not in word.tags:
+            word.tags.append(word.level)
+
+        try:
+            db_row_id = self.db.save_word(word)
+            logger.info(f"Saved word to database: {word.dutch} (row_id: {db_row_id})")
+            return db_row_id
+        except Exception as e:
+            logger.error(f"Failed to save word to database: {word.dutch} - {e}")
+            raise
+
     def create(self, word: Word) -> tuple[Word, bool]:
         """
         Create a new word and sync to Anki.
@@ -241,6 +277,20 @@ class WordService:
             logger.debug(f"Word not found by ID: {word_id}")
         return word
 
+    def get_many(self, dutch_list: List[str]) -> dict:
+        """
+        Get several words from the database in one query.
+
+        Args:
+            dutch_list: The Dutch words to look up
+
+        Returns:
+            Dictionary of normalized Dutch text to (word_id, Word) for the words found
+        """
+        found = self.db.get_words_with_ids(dutch_list)
+        logger.debug(f"Retrieved {len(found)}/{len(dutch_list)} words")
+        return found
+
     def get_id(self, dutch: str) -> Optional[int]:
         """
         Get a word's database ID by its Dutch text.
@@ -370,46 +420,117 @@ class WordService:
         Returns:
             Tuple of (total_saved, total_synced)
         """
-        total_saved = 0
         total_synced = 0
 
+        saved_words = []
         for word in words:
             try:
-                db_row_id, anki_note_id = self._save_and_sync_word(word)
-                total_saved += 1
-                if anki_note_id:
-                    total_synced += 1
+                self.save(word)
+                saved_words.append(word)
             except Exception as e:
                 logger.error(f"Failed to save and sync word: {word.dutch} - {e}")
+        total_saved = len(saved_words)
+
+        # Add every saved word and sync with AnkiWeb in one AnkiConnect request
+        synced = [(word.dutch, note_id) for word, note_id in self._sync_words_to_anki(saved_words) if note_id]
+        if synced:
+            try:
+                self.db.mark_multiple_synced([dutch for dutch, _ in synced], [note_id for _, note_id in synced], self.deck_name)
+                total_synced = len(synced)
+            except Exception as e:
+                logger.error(f"Failed to mark {len(synced)} words as synced - {e}")
 
         logger.info(f"Batch create: {total_saved}/{len(words)} saved, {total_synced}/{len(words)} synced")
         return total_saved, total_synced
 
+    def apply_bulk(self, ops: List[tuple[str, Word]]) -> tuple[int, int]:
+        """
+        Apply a batch of ("delete", word) / ("save", word) operations.
+
+        The database changes are committed in one transaction, then the deleted
+        notes are removed from Anki and the saved words added/updated in one
+        request each. Doesn't sync with AnkiWeb; bulk commands call this many
+        times, so syncing is left to the caller.
+
+        Args:
+            ops: List of (action, word) tuples
+
+        Returns:
+            Tuple of (total_saved, total_synced)
+
+        Raises:
+            Exception: If the database transaction fails
+        """
+        deletes = [word.dutch for action, word in ops if action == "delete"]
+        saves = [word for action, word in ops if action == "save"]
+
+        for word in saves:
+            # Add level as a tag if it exists and is not already in tags
+            if word.level and word.level not in word.tags:
+                word.tags.append(word.level)
+
+        try:
+            _, deleted_note_ids = self.db.apply_bulk(deletes, saves)
+        except Exception as e:
+            logger.error(f"Failed to apply {len(ops)} word changes to database - {e}")
+            raise
+        logger.info(f"Applied bulk changes: {len(deletes)} deleted, {len(saves)} saved")
+
+        if deleted_note_ids and ENABLE_ANKI_SYNC:
+            if not delete_notes(deleted_note_ids):
+                logger.warning(f"Failed to delete {len(deleted_note_ids)} notes from Anki")
+
+        synced = [(word.dutch, note_id) for word, note_id in self._sync_words_to_anki(saves, sync=False) if note_id]
+        if synced:
+            try:
+                self.db.mark_multiple_synced([dutch for dutch, _ in synced], [note_id for _, note_id in synced], self.deck_name)
+            except Exception as e:
+                logger.error(f"Failed to mark {len(synced)} words as synced - {e}")
+                synced = []
+
+        return len(saves), len(synced)
+
     # ==================== Query Operations ====================
 
-    def get_all(self) -> List[Word]:
+    def get_all(self, limit: Optional[int] = None, offset: int = 0) -> List[Word]:
         """
-        Get all words from the database.
+        Get all words from the database, newest first.
+
+        Args:
+            limit: Maximum number of words to return (all if None)
+            offset: Number of words to skip, for paging
 
         Returns:
-            List of all Word objects
+            List of Word objects
         """
-        words = self.db.get_all_words()
+        words = self.db.get_all_words(limit=limit, offset=offset)
         logger.debug(f"Retrieved {len(words)} words")
         return words
 
-    def search(self, query: str) -> List[Word]:
+    def iter_all(self) -> Iterator[Word]:
+        """
+        Iterate over all words in the database without loading them into one list.
+
+        Returns:
+            Iterator of Word objects, newest first
+        """
+        return self.db.iter_all_words()
+
+    def search(self, query: str, limit: Optional[int] = None, offset: int = 0, prefix: bool = False) -> List[Word]:
         """
         Search for words matching the query.
 
         Args:
             query: Search term (matches Dutch, translation, or definitions)
+            limit: Maximum number of words to return (all if None)
+            offset: Number of matches to skip, for paging
+            prefix: Only match Dutch words starting with the query (autocomplete)
 
         Returns:
             List of matching Word objects
         """
         query = query.lower() # Normalize search query to lowercase
-        words = self.db.search_words(query)
+        words = self.db.search_words(query, limit=limit, offset=offset, prefix=prefix)
         logger.debug(f"Search '{query}' returned {len(words)} results")
         return words
 
@@ -424,6 +545,28 @@ class WordService:
         logger.debug(f"Found {len(words)} unsynced words")
         return words
 
+    def get_without_level(self) -> List[Word]:
+        """
+        Get all words that don't have a difficulty level yet.
+
+        Returns:
+            List of Word objects without a level
+        """
+        words = self.db.get_words_without_level()
+        logger.debug(f"Found {len(words)} words without level")
+        return words
+
+    def get_without_tags(self) -> List[Word]:
+        """
+        Get all words that don't have any tags yet.
+
+        Returns:
+            List of Word objects without tags
+        """
+        words = self.db.get_words_without_tags()
+        logger.debug(f"Found {len(words)} words without tags")
+        return words
+
     # ==================== Statistics ====================
 
     def get_stats(self) -> dict:
@@ -497,8 +640,9 @@ class WordService:
 
             synced_count = 0
             failed_count = 0
+            new_words = []
 
-            # Sync each word to Anki
+            # Update words that already have a note, collect the rest
             for word in all_words:
                 try:
                     # Check if we already have an anki_note_id for this word
@@ -516,27 +660,38 @@ class WordService:
                             failed_count += 1
                             logger.warning(f"Failed to update existing note for: {word.dutch}")
                     else:
-                        # No note ID in database - use normal add/update flow
-                        anki_note_id = self._sync_word_to_anki(word)
-
-                        if anki_note_id:
-                            # Mark as synced in database
-                            self.db.mark_synced(word.dutch, anki_note_id, self.deck_name)
-                            synced_count += 1
-                        else:
-                            failed_count += 1
-                            logger.warning(f"Failed to sync word to Anki: {word.dutch}")
+                        # No note ID in database - add it with the others below
+                        new_words.append(word)
                 except Exception as e:
                     failed_count += 1
                     logger.error(f"Error syncing word {word.dutch}: {e}")
 
-            logger.info(f"Synced {synced_count}/{len(all_words)} words to Anki ({failed_count} failed)")
+            if new_words:
+                # Add the new words and sync with AnkiWeb in one AnkiConnect request
+                synced = []
+                for word, anki_note_id in self._sync_words_to_anki(new_words):
+                    if anki_note_id:
+                        synced.append((word.dutch, anki_note_id))
+                    else:
+                        failed_count += 1
+                        logger.warning(f"Failed to sync word to Anki: {word.dutch}")
+
+                if synced:
+                    # Mark them all as synced in database in one go
+                    try:
+                        self.db.mark_multiple_synced([dutch for dutch, _ in synced], [note_id for _, note_id in synced], self.deck_name)
+                        synced_count += len(synced)
+                    except Exception as e:
+                        failed_count += len(synced)
+                        logger.error(f"Failed to mark {len(synced)} words as synced - {e}")
+            else:
+                # Sync with AnkiWeb
+                sync_result = sync_anki()
 
-            # Sync with AnkiWeb
-            sync_result = sync_anki()
+                if sync_result and sync_result.get('error'):
+                    logger.warning(f"AnkiWeb sync warning: {sync_result['error']}")
 
-            if sync_result and sync_result.get('error'):
-                logger.warning(f"AnkiWeb sync warning: {sync_result['error']}")
+            logger.info(f"Synced {synced_count}/{len(all_words)} words to Anki ({failed_count} failed)")
 
             return {
                 'success': True,
@@ -562,7 +717,7 @@ class WordService:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Cleanup when exiting context."""
-        # Database connections are managed per-operation, no cleanup needed
+        # The shared database keeps its per-thread connections open, no cleanup needed
         pass
 
     # ==================== Representation ====================